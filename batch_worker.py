@@ -0,0 +1,191 @@
+"""
+Batch Worker
+Arq worker that routes non-real-time syndication checks through the OpenAI Batch API
+
+Run with: arq batch_worker.WorkerSettings
+"""
+from arq import cron
+from arq.connections import RedisSettings
+from typing import Dict
+import asyncio
+import httpx
+import orjson
+import os
+import uuid
+
+from main import (
+    SyndicationCheckRequest,
+    get_rentcast_client,
+    get_syndication_checker,
+    get_openai_analyzer,
+    build_syndication_payload,
+    logger,
+    LOVABLE_SYNDICATION_WEBHOOK,
+    LOVABLE_AUTH_TOKEN
+)
+
+
+# Redis keys
+PENDING_KEY = "seo_batch:pending"    # list of Batch API request lines awaiting submission
+JOBS_KEY = "seo_batch:jobs"          # custom_id -> listing_id + syndication results
+BATCHES_KEY = "seo_batch:batches"    # batch_id -> custom_ids in that batch
+
+MAX_BATCH_SIZE = 100
+
+
+async def prepare_syndication_check(ctx: Dict, request: Dict):
+    """Run the syndication check and queue the SEO request for the next batch"""
+    request = SyndicationCheckRequest(**request)
+    redis = ctx["redis"]
+
+    syndication_results, market_data = await asyncio.gather(
+        asyncio.to_thread(
+            get_syndication_checker().check_all_sites,
+            address=request.address,
+            city=request.city,
+            state=request.state
+        ),
+        get_rentcast_client().get_market_data(
+            address=f"{request.address}, {request.city}, {request.state}",
+            bedrooms=request.bedrooms,
+            bathrooms=request.bathrooms,
+            square_footage=request.square_footage,
+            radius=0.5
+        )
+    )
+
+    # Nothing for the model to work with: send the default analysis now instead of batching
+    analyzer = get_openai_analyzer()
+    default = analyzer.no_context_recommendations(
+        request.description,
+        request.amenities,
+        request.photos_count,
+        syndication_results,
+        market_data
+    )
+    if default is not None:
+        payload = build_syndication_payload(request.listing_id, syndication_results, default)
+        await send_to_lovable(ctx, request.listing_id, payload)
+        return
+
+    custom_id = f"{request.listing_id}:{uuid.uuid4().hex}"
+    batch_request = analyzer.build_batch_request(
+        custom_id,
+        address=request.address,
+        title=request.title,
+        description=request.description,
+        price=request.price,
+        bedrooms=request.bedrooms,
+        bathrooms=request.bathrooms,
+        square_footage=request.square_footage,
+        amenities=request.amenities,
+        photos_count=request.photos_count,
+        syndication_results=syndication_results,
+        market_data=market_data
+    )
+
+    await redis.hset(JOBS_KEY, custom_id, orjson.dumps({
+        "listing_id": request.listing_id,
+        "syndication_results": syndication_results
+    }))
+    await redis.rpush(PENDING_KEY, orjson.dumps(batch_request))
+
+    logger.info("Queued batch SEO request for %s", request.listing_id)
+
+
+async def submit_seo_batch(ctx: Dict):
+    """Submit up to MAX_BATCH_SIZE pending requests as one OpenAI batch"""
+    redis = ctx["redis"]
+
+    pipe = redis.pipeline(transaction=True)
+    pipe.lrange(PENDING_KEY, 0, MAX_BATCH_SIZE - 1)
+    pipe.ltrim(PENDING_KEY, MAX_BATCH_SIZE, -1)
+    pending, _ = await pipe.execute()
+
+    if not pending:
+        return
+
+    batch_requests = [orjson.loads(line) for line in pending]
+
+    try:
+        batch_id = await get_openai_analyzer().submit_batch(batch_requests)
+    except Exception as e:
+        # Put the requests back so the next window retries them
+        logger.exception("Failed to submit SEO batch: %s", e)
+        await redis.lpush(PENDING_KEY, *reversed(pending))
+        return
+
+    custom_ids = [r["custom_id"] for r in batch_requests]
+    await redis.hset(BATCHES_KEY, batch_id, orjson.dumps(custom_ids))
+
+    logger.info("Submitted SEO batch %s with %d requests", batch_id, len(custom_ids))
+
+
+async def poll_seo_batches(ctx: Dict):
+    """Dispatch results of finished batches to the Lovable webhook"""
+    redis = ctx["redis"]
+
+    for batch_id, custom_ids in (await redis.hgetall(BATCHES_KEY)).items():
+        batch_id = batch_id.decode()
+        custom_ids = orjson.loads(custom_ids)
+        results = await get_openai_analyzer().get_batch_results(batch_id, custom_ids)
+
+        if results is None:
+            continue
+
+        for custom_id in custom_ids:
+            job = await redis.hget(JOBS_KEY, custom_id)
+            if job is None:
+                continue
+
+            job = orjson.loads(job)
+            payload = build_syndication_payload(job["listing_id"], job["syndication_results"], results[custom_id])
+            await send_to_lovable(ctx, job["listing_id"], payload)
+
+            await redis.hdel(JOBS_KEY, custom_id)
+
+        await redis.hdel(BATCHES_KEY, batch_id)
+        logger.info("SEO batch %s complete", batch_id)
+
+
+async def send_to_lovable(ctx: Dict, listing_id: str, payload: Dict):
+    """POST syndication results to the Lovable webhook, logging failures"""
+    try:
+        response = await ctx["http"].post(
+            LOVABLE_SYNDICATION_WEBHOOK,
+            content=orjson.dumps(payload),
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {LOVABLE_AUTH_TOKEN}"
+            }
+        )
+
+        if response.status_code == 200:
+            logger.info("Batch syndication results sent to Lovable for %s", listing_id)
+        else:
+            logger.error("Failed to send to Lovable: %s - %s", response.status_code, response.text)
+    except Exception as e:
+        logger.exception("Error sending batch results for %s: %s", listing_id, e)
+
+
+async def startup(ctx: Dict):
+    ctx["http"] = httpx.AsyncClient(http2=True, timeout=60)
+
+
+async def shutdown(ctx: Dict):
+    await ctx["http"].aclose()
+    if get_rentcast_client.cache_info().currsize:
+        await get_rentcast_client().client.aclose()
+    if get_openai_analyzer.cache_info().currsize:
+        await get_openai_analyzer().aclose()
+
+
+class WorkerSettings:
+    functions = [prepare_syndication_check]
+    cron_jobs = [
+        cron(submit_seo_batch, minute=set(range(0, 60, 5))),  # 5-minute accumulation window
+        cron(poll_seo_batches, minute=set(range(60)))
+    ]
+    on_startup = startup
+    on_shutdown = shutdown
+    redis_settings = RedisSettings.from_dsn(os.getenv("REDIS_URL", "redis://localhost:6379"))
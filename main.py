@@ -10,15 +10,27 @@
 Leasing Intelligence Service
 FastAPI web service for market analysis and syndication checking
 """
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import os
+import asyncio
+import atexit
+import logging
+import logging.handlers
+import queue
 from dotenv import load_dotenv
 import requests
 import httpx
-import json
+import orjson
+from arq import create_pool
+from arq.connections import RedisSettings
+from redis.exceptions import RedisError
+from contextlib import asynccontextmanager
+from functools import cache
+from itertools import islice
 
 from rentcast_client import RentCastClient
 from syndication_checker import SyndicationChecker
@@ -28,11 +40,85 @@ from showmojo_client import ShowMojoClient
 # Load environment variables
 load_dotenv()
 
+# Logging - records are queued on the event loop thread and written by a background listener.
+# The listener lives as long as the process: the arq batch worker imports this module
+# without running the app lifespan, so it is started here and stopped at exit
+logger = logging.getLogger("leasing")
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+logger.propagate = False
+_log_queue = queue.Queue(-1)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Clients are created lazily on first use so cold starts don't pay for unused endpoints
+REDIS_URL = os.getenv("REDIS_URL")
+
+
+@cache
+def get_rentcast_client() -> RentCastClient:
+    return RentCastClient(api_key=os.getenv("RENTCAST_API_KEY"))
+
+
+@cache
+def get_syndication_checker() -> SyndicationChecker:
+    return SyndicationChecker()
+
+
+@cache
+def get_openai_analyzer() -> OpenAIAnalyzer:
+    return OpenAIAnalyzer(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        redis_url=REDIS_URL
+    )
+
+
+@cache
+def get_showmojo_client() -> ShowMojoClient:
+    return ShowMojoClient(
+        email=os.getenv("SHOWMOJO_EMAIL"),
+        password=os.getenv("SHOWMOJO_PASSWORD")
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own shared HTTP/queue clients and release pooled connections on shutdown"""
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=60,
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=50)
+    )
+    # Arq queue for batch syndication checks (only when Redis is configured). Batch mode
+    # is optional, so an unreachable Redis disables it instead of failing startup
+    app.state.arq = None
+    if REDIS_URL:
+        try:
+            app.state.arq = await create_pool(RedisSettings.from_dsn(REDIS_URL))
+        except (RedisError, OSError, asyncio.TimeoutError) as e:
+            logger.error("Redis unavailable, batch syndication checks disabled: %s", e)
+    yield
+    await app.state.http.aclose()
+    if app.state.arq is not None:
+        await app.state.arq.close()
+    if get_rentcast_client.cache_info().currsize:
+        await get_rentcast_client().client.aclose()
+    if get_showmojo_client.cache_info().currsize:
+        get_showmojo_client().close()
+    if get_openai_analyzer.cache_info().currsize:
+        await get_openai_analyzer().aclose()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Leasing Intelligence Service",
     description="Market analysis and syndication checking for rental listings",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -44,15 +130,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize clients
-rentcast_client = RentCastClient(api_key=os.getenv("RENTCAST_API_KEY"))
-syndication_checker = SyndicationChecker()
-openai_analyzer = OpenAIAnalyzer(api_key=os.getenv("OPENAI_API_KEY"))
-showmojo_client = ShowMojoClient(
-    email=os.getenv("SHOWMOJO_EMAIL"),
-    password=os.getenv("SHOWMOJO_PASSWORD")
-)
-
 # Lovable webhook URLs
 LOVABLE_MARKET_WEBHOOK = os.getenv("LOVABLE_MARKET_DATA_WEBHOOK")
 LOVABLE_SYNDICATION_WEBHOOK = os.getenv("LOVABLE_SYNDICATION_WEBHOOK")
@@ -88,6 +165,7 @@ class SyndicationCheckRequest(BaseModel):
     square_footage: int
     amenities: List[str]
     photos_count: int
+    batch: bool = False  # Route through the OpenAI Batch API (results arrive within hours)
 
 
 class ShowingsRequest(BaseModel):
@@ -107,7 +185,11 @@ async def root():
 
 
 @app.post("/analyze-market")
-async def analyze_market(request: MarketAnalysisRequest, background_tasks: BackgroundTasks):
+async def analyze_market(
+    request: MarketAnalysisRequest,
+    background_tasks: BackgroundTasks,
+    rentcast_client: RentCastClient = Depends(get_rentcast_client)
+):
     """
     Analyze market data for a listing using RentCast API
     Sends results to Lovable webhook
@@ -116,7 +198,8 @@ async def analyze_market(request: MarketAnalysisRequest, background_tasks: Backg
         # Start analysis in background
         background_tasks.add_task(
             _process_market_analysis,
-            request
+            request,
+            rentcast_client
         )
         
         return {
@@ -130,16 +213,40 @@ async def analyze_market(request: MarketAnalysisRequest, background_tasks: Backg
 
 
 @app.post("/check-syndication")
-async def check_syndication(request: SyndicationCheckRequest, background_tasks: BackgroundTasks):
+async def check_syndication(
+    request: SyndicationCheckRequest,
+    background_tasks: BackgroundTasks,
+    syndication_checker: SyndicationChecker = Depends(get_syndication_checker),
+    rentcast_client: RentCastClient = Depends(get_rentcast_client),
+    openai_analyzer: OpenAIAnalyzer = Depends(get_openai_analyzer)
+):
     """
     Check syndication status and generate SEO recommendations
     Sends results to Lovable webhook
     """
+    if request.batch and app.state.arq is None:
+        if not REDIS_URL:
+            raise HTTPException(status_code=400, detail="Batch mode requires REDIS_URL")
+        raise HTTPException(status_code=503, detail="Batch queue unavailable")
+    
     try:
+        if request.batch:
+            # Queue for the batch worker (see batch_worker.py)
+            await app.state.arq.enqueue_job("prepare_syndication_check", request.model_dump())
+            
+            return {
+                "status": "queued",
+                "message": "Syndication check queued for batch processing",
+                "listing_id": request.listing_id
+            }
+        
         # Start check in background
         background_tasks.add_task(
             _process_syndication_check,
-            request
+            request,
+            syndication_checker,
+            rentcast_client,
+            openai_analyzer
         )
         
         return {
@@ -153,7 +260,11 @@ async def check_syndication(request: SyndicationCheckRequest, background_tasks:
 
 
 @app.post("/sync-showings")
-async def sync_showings(request: ShowingsRequest, background_tasks: BackgroundTasks):
+async def sync_showings(
+    request: ShowingsRequest,
+    background_tasks: BackgroundTasks,
+    showmojo_client: ShowMojoClient = Depends(get_showmojo_client)
+):
     """
     Sync showing data from ShowMojo
     Fetches showing data and sends to Lovable webhook
@@ -162,7 +273,8 @@ async def sync_showings(request: ShowingsRequest, background_tasks: BackgroundTa
         # Start sync in background
         background_tasks.add_task(
             _process_showings_sync,
-            request
+            request,
+            showmojo_client
         )
         
         return {
@@ -176,13 +288,13 @@ async def sync_showings(request: ShowingsRequest, background_tasks: BackgroundTa
 
 
 # Background tasks
-async def _process_market_analysis(request: MarketAnalysisRequest):
+async def _process_market_analysis(request: MarketAnalysisRequest, rentcast_client: RentCastClient):
     """Process market analysis and send to Lovable"""
     try:
-        print(f"Starting market analysis for {request.address}...")
+        logger.info("Starting market analysis for %s...", request.address)
         
         # Get market data from RentCast
-        market_data = rentcast_client.get_market_data(
+        market_data = await rentcast_client.get_market_data(
             address=f"{request.address}, {request.city}, {request.state}",
             bedrooms=request.bedrooms,
             bathrooms=request.bathrooms,
@@ -192,7 +304,7 @@ async def _process_market_analysis(request: MarketAnalysisRequest):
         )
         
         if not market_data.get("success"):
-            print(f"Market analysis failed: {market_data.get('error')}")
+            logger.warning("Market analysis failed: %s", market_data.get("error"))
             return
         
         # Prepare data for Lovable
@@ -207,77 +319,105 @@ async def _process_market_analysis(request: MarketAnalysisRequest):
         market_avg_dom = market_stats.get("market_avg_dom", 0)
         dom_vs_market_pct = round(((request.days_on_market - market_avg_dom) / market_avg_dom * 100), 2) if market_avg_dom > 0 else 0
         
-        # Build payload for Lovable
-        payload = {
+        # Header record for Lovable; comparables follow as one NDJSON line each
+        header = {
             "listing_id": request.listing_id,
             "radius": request.radius,
             **market_stats,
             "listing_rent_per_sqft": listing_rent_per_sqft,
             "rent_vs_market_pct": rent_vs_market_pct,
-            "dom_vs_market_pct": dom_vs_market_pct,
-            "comparables": [
-                {
-                    "comp_address": c.get("address", ""),
-                    "comp_rent": c.get("price", 0),
-                    "comp_rent_per_sqft": round(c.get("price", 0) / c.get("squareFootage", 1), 2) if c.get("squareFootage") else 0,
-                    "comp_bedrooms": c.get("bedrooms", 0),
-                    "comp_bathrooms": c.get("bathrooms", 0),
-                    "comp_square_footage": c.get("squareFootage", 0),
-                    "comp_days_on_market": c.get("daysOnMarket", 0),
-                    "comp_status": c.get("status", "Unknown"),
-                    "distance": c.get("distance", 0)
-                }
-                for c in comparables[:50]  # Limit to 50 comps
-            ]
+            "dom_vs_market_pct": dom_vs_market_pct
         }
         
-        # Send to Lovable webhook
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                LOVABLE_MARKET_WEBHOOK,
-                json=payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {LOVABLE_AUTH_TOKEN}"
-                },
-                timeout=30.0
-            )
-            
-            if response.status_code == 200:
-                print(f"Market data sent to Lovable successfully for {request.listing_id}")
-            else:
-                print(f"Failed to send to Lovable: {response.status_code} - {response.text}")
+        # Stream to Lovable webhook
+        async with app.state.http.stream(
+            "POST",
+            LOVABLE_MARKET_WEBHOOK,
+            content=_market_ndjson(header, comparables),
+            headers={
+                "Content-Type": "application/x-ndjson",
+                "Authorization": f"Bearer {LOVABLE_AUTH_TOKEN}"
+            },
+            timeout=30.0
+        ) as response:
+            await response.aread()
+        
+        if response.status_code == 200:
+            logger.info("Market data sent to Lovable successfully for %s", request.listing_id)
+        else:
+            logger.error("Failed to send to Lovable: %s - %s", response.status_code, response.text)
     
     except Exception as e:
-        print(f"Error in market analysis: {e}")
+        logger.exception("Error in market analysis: %s", e)
+
+
+async def _market_ndjson(header: dict, comparables: List[dict], limit: int = 50):
+    """Yield the market header then each comparable as NDJSON lines"""
+    yield orjson.dumps(header) + b"\n"
+    
+    for c in islice(comparables, limit):
+        comp = {
+            "comp_address": c.get("address", ""),
+            "comp_rent": c.get("price", 0),
+            "comp_rent_per_sqft": round(c.get("price", 0) / c.get("squareFootage", 1), 2) if c.get("squareFootage") else 0,
+            "comp_bedrooms": c.get("bedrooms", 0),
+            "comp_bathrooms": c.get("bathrooms", 0),
+            "comp_square_footage": c.get("squareFootage", 0),
+            "comp_days_on_market": c.get("daysOnMarket", 0),
+            "comp_status": c.get("status", "Unknown"),
+            "distance": c.get("distance", 0)
+        }
+        yield orjson.dumps(comp) + b"\n"
 
 
-async def _process_syndication_check(request: SyndicationCheckRequest):
+def build_syndication_payload(listing_id: str, syndication_results: dict, ai_analysis: dict) -> dict:
+    """Build the Lovable syndication webhook payload"""
+    return {
+        "listing_id": listing_id,
+        **syndication_results,
+        "overall_seo_score": ai_analysis.get("overall_seo_score", 50),
+        "site_scores": ai_analysis.get("site_scores", {}),
+        "ai_recommendations": {
+            "quick_wins": ai_analysis.get("quick_wins", []),
+            "high_priority_actions": ai_analysis.get("high_priority_actions", []),
+            "site_specific_tips": ai_analysis.get("site_specific_tips", {})
+        }
+    }
+
+
+async def _process_syndication_check(
+    request: SyndicationCheckRequest,
+    syndication_checker: SyndicationChecker,
+    rentcast_client: RentCastClient,
+    openai_analyzer: OpenAIAnalyzer
+):
     """Process syndication check and send to Lovable"""
     try:
-        print(f"Starting syndication check for {request.address}...")
+        logger.info("Starting syndication check for %s...", request.address)
         
-        # Check syndication sites
-        syndication_results = syndication_checker.check_all_sites(
-            address=request.address,
-            city=request.city,
-            state=request.state
+        # Syndication check and market fetch are independent - run concurrently
+        # (market data is for AI context; RentCast responses are cached)
+        syndication_results, market_data = await asyncio.gather(
+            asyncio.to_thread(
+                syndication_checker.check_all_sites,
+                address=request.address,
+                city=request.city,
+                state=request.state
+            ),
+            rentcast_client.get_market_data(
+                address=f"{request.address}, {request.city}, {request.state}",
+                bedrooms=request.bedrooms,
+                bathrooms=request.bathrooms,
+                square_footage=request.square_footage,
+                radius=0.5
+            )
         )
         
-        print(f"Syndication check complete: {syndication_results['total_sites_found']}/27 sites found")
-        
-        # Get market data for AI context (optional, use cached if available)
-        market_data = rentcast_client.get_market_data(
-            address=f"{request.address}, {request.city}, {request.state}",
-            bedrooms=request.bedrooms,
-            bathrooms=request.bathrooms,
-            square_footage=request.square_footage,
-            radius=0.5
-        )
+        logger.info("Syndication check complete: %s/27 sites found", syndication_results["total_sites_found"])
         
         # Generate AI recommendations
-        print("Generating AI SEO recommendations...")
-        ai_analysis = openai_analyzer.analyze_listing_seo(
+        logger.info("Generating AI SEO recommendations...")
+        ai_analysis = await openai_analyzer.analyze_listing_seo(
             address=request.address,
             title=request.title,
             description=request.description,
@@ -291,46 +431,35 @@ async def _process_syndication_check(request: SyndicationCheckRequest):
             market_data=market_data
         )
         
-        print(f"AI analysis complete: SEO score {ai_analysis.get('overall_seo_score', 0)}/100")
+        logger.info("AI analysis complete: SEO score %s/100", ai_analysis.get("overall_seo_score", 0))
         
         # Build payload for Lovable
-        payload = {
-            "listing_id": request.listing_id,
-            **syndication_results,
-            "overall_seo_score": ai_analysis.get("overall_seo_score", 50),
-            "site_scores": ai_analysis.get("site_scores", {}),
-            "ai_recommendations": {
-                "quick_wins": ai_analysis.get("quick_wins", []),
-                "high_priority_actions": ai_analysis.get("high_priority_actions", []),
-                "site_specific_tips": ai_analysis.get("site_specific_tips", {})
-            }
-        }
+        payload = build_syndication_payload(request.listing_id, syndication_results, ai_analysis)
         
         # Send to Lovable webhook
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                LOVABLE_SYNDICATION_WEBHOOK,
-                json=payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {LOVABLE_AUTH_TOKEN}"
-                },
-                timeout=60.0
-            )
-            
-            if response.status_code == 200:
-                print(f"Syndication results sent to Lovable successfully for {request.listing_id}")
-            else:
-                print(f"Failed to send to Lovable: {response.status_code} - {response.text}")
+        response = await app.state.http.post(
+            LOVABLE_SYNDICATION_WEBHOOK,
+            content=orjson.dumps(payload),
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {LOVABLE_AUTH_TOKEN}"
+            },
+            timeout=60.0
+        )
+        
+        if response.status_code == 200:
+            logger.info("Syndication results sent to Lovable successfully for %s", request.listing_id)
+        else:
+            logger.error("Failed to send to Lovable: %s - %s", response.status_code, response.text)
     
     except Exception as e:
-        print(f"Error in syndication check: {e}")
+        logger.exception("Error in syndication check: %s", e)
 
 
-async def _process_showings_sync(request: ShowingsRequest):
+async def _process_showings_sync(request: ShowingsRequest, showmojo_client: ShowMojoClient):
     """Process ShowMojo showing data sync and send to Lovable"""
     try:
-        print(f"🔄 Starting ShowMojo sync for last {request.days_back} days...")
+        logger.info("🔄 Starting ShowMojo sync for last %s days...", request.days_back)
         
         # Fetch showing data from ShowMojo
         showings_data = showmojo_client.get_showings(
@@ -339,16 +468,18 @@ async def _process_showings_sync(request: ShowingsRequest):
         )
         
         if not showings_data.get("success"):
-            print(f"❌ ShowMojo sync failed: {showings_data.get('error')}")
+            logger.warning("❌ ShowMojo sync failed: %s", showings_data.get("error"))
             return
         
         showings = showings_data.get("showings", [])
-        print(f"✅ Retrieved {len(showings)} showings from ShowMojo")
+        logger.info("✅ Retrieved %d showings from ShowMojo", len(showings))
         
-        # DEBUG: Print first showing to verify data structure
-        if showings:
-            print(f"🔍 DEBUG - First showing data:")
-            print(json.dumps(showings[0], indent=2))
+        # DEBUG: Log first showing to verify data structure
+        if showings and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "🔍 First showing data:\n%s",
+                orjson.dumps(showings[0], option=orjson.OPT_INDENT_2).decode()
+            )
         
         # Build payload for Lovable
         payload = {
@@ -358,38 +489,37 @@ async def _process_showings_sync(request: ShowingsRequest):
             "showings": showings
         }
         
-        # DEBUG: Print webhook URL and payload summary
-        print(f"🔍 DEBUG - Webhook URL: {LOVABLE_SHOWINGS_WEBHOOK}")
-        print(f"🔍 DEBUG - Payload summary: {len(showings)} showings, timestamp: {payload['sync_timestamp']}")
-        if len(showings) > 0:
-            print(f"🔍 DEBUG - First 3 showings:")
-            print(json.dumps(showings[:3], indent=2))
+        # DEBUG: Log webhook URL and payload summary
+        logger.debug("🔍 Webhook URL: %s", LOVABLE_SHOWINGS_WEBHOOK)
+        logger.debug("🔍 Payload summary: %d showings, timestamp: %s", len(showings), payload["sync_timestamp"])
+        if showings and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "🔍 First 3 showings:\n%s",
+                orjson.dumps(showings[:3], option=orjson.OPT_INDENT_2).decode()
+            )
         
         # Send to Lovable webhook
-        print("📤 Sending to webhook...")
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                LOVABLE_SHOWINGS_WEBHOOK,
-                json=payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {LOVABLE_AUTH_TOKEN}"
-                },
-                timeout=60.0
-            )
-            
-            print(f"📥 Webhook response status: {response.status_code}")
-            print(f"📥 Webhook response body: {response.text[:500]}")
-            
-            if response.status_code == 200:
-                print(f"✅ Showing data sent to Lovable successfully: {len(showings)} showings")
-            else:
-                print(f"❌ Failed to send to Lovable: {response.status_code} - {response.text}")
+        logger.info("📤 Sending to webhook...")
+        response = await app.state.http.post(
+            LOVABLE_SHOWINGS_WEBHOOK,
+            content=orjson.dumps(payload),
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {LOVABLE_AUTH_TOKEN}"
+            },
+            timeout=60.0
+        )
+        
+        logger.debug("📥 Webhook response status: %s", response.status_code)
+        logger.debug("📥 Webhook response body: %s", response.text[:500])
+        
+        if response.status_code == 200:
+            logger.info("✅ Showing data sent to Lovable successfully: %d showings", len(showings))
+        else:
+            logger.error("❌ Failed to send to Lovable: %s - %s", response.status_code, response.text)
     
     except Exception as e:
-        print(f"❌ Error in ShowMojo sync: {e}")
-        import traceback
-        print(f"Full traceback: {traceback.format_exc()}")
+        logger.exception("❌ Error in ShowMojo sync: %s", e)
 
 
 if __name__ == "__main__":
@@ -2,17 +2,145 @@
 OpenAI SEO Analyzer
 Generates SEO recommendations for rental listings using OpenAI GPT-4
 """
-from openai import OpenAI
-from typing import Dict, List
-import json
+from openai import (
+    AsyncOpenAI, APIConnectionError, APITimeoutError, ConflictError, InternalServerError, RateLimitError
+)
+from pydantic import BaseModel, ConfigDict, Field, conlist
+from typing import Dict, List, Optional
+import asyncio
+import copy
+import httpx
+import logging
+import orjson
+import random
+import re
+import tiktoken
+
+from semantic_cache import SemanticCache
+
+
+# Child of the service logger; silent unless the app configures handlers
+logger = logging.getLogger("leasing.openai")
+logger.addHandler(logging.NullHandler())
+
+
+class SiteTips(BaseModel):
+    model_config = ConfigDict(extra="forbid", populate_by_name=True)
+    
+    Zillow: conlist(str, max_length=2)
+    Zumper: conlist(str, max_length=2)
+    HotPads: conlist(str, max_length=2)
+    Realtor_com: conlist(str, max_length=2) = Field(alias="Realtor.com")
+    Redfin: conlist(str, max_length=2)
+    Trulia: conlist(str, max_length=2)
+
+
+class SiteScores(BaseModel):
+    model_config = ConfigDict(extra="forbid", populate_by_name=True)
+    
+    Zillow: int
+    Zumper: int
+    HotPads: int
+    Realtor_com: int = Field(alias="Realtor.com")
+    Redfin: int
+    Trulia: int
+
+
+class SeoRecommendations(BaseModel):
+    """SEO response schema, enforced server-side by OpenAI structured outputs"""
+    model_config = ConfigDict(extra="forbid")
+    
+    overall_seo_score: int
+    quick_wins: conlist(str, max_length=3)
+    high_priority_actions: conlist(str, max_length=3)
+    site_specific_tips: SiteTips
+    site_scores: SiteScores
+
+
+SEO_RESPONSE_SCHEMA = SeoRecommendations.model_json_schema()
+
+MAX_CONTEXT_TOKENS = 120_000
+
+# Fixed caps on listing fields in the prompt, and the floor for trimming the uncapped ones
+MAX_DESCRIPTION_CHARS = 300
+MAX_AMENITIES = 10
+MIN_FIELD_CHARS = 100
+
+# Constant system message sent first on every call. At ~300 tokens the prefix is below
+# the 1024-token minimum for OpenAI's automatic prompt caching, and is deliberately not
+# padded to reach it (padding costs more than the cached-token discount saves)
+SYSTEM_PROMPT = """You are an expert SEO analyst for rental listings on Zillow, Zumper, HotPads, Realtor.com, Redfin and Trulia. Analyze the listing JSON and return recommendations in the required schema.
+
+Input keys: addr, title, desc (truncated), price ($/mo), br, ba, sqft, ppsf ($/sqft), amen, photos, sites_found (of 27), top6_found (of 6), missing (sample of sites not found), mkt_rent (market avg rent), vs_mkt (% rent vs market), mkt_dom (market avg days on market), comps (similar listings).
+
+Guidelines:
+- quick_wins: actions that take less than 30 minutes
+- high_priority_actions: biggest impact on visibility
+- site_specific_tips: tailored to each platform's ranking algorithm
+- site_scores / overall_seo_score: 0-100, how well optimized the listing is
+Consider: photo quality and quantity (Zillow loves 15+ photos); title keywords, location and amenities; description length and quality (250+ words performs better); pricing vs market; amenity highlighting; freshness (recent updates boost rankings)."""
+
+
+# Returned without calling OpenAI when there is no market/syndication context
+DEFAULT_RECOMMENDATIONS = {
+    "quick_wins": [
+        "Upload at least 15 high-quality photos, leading with the best exterior and kitchen shots",
+        "Put bedrooms, bathrooms, neighborhood and a standout amenity in the title",
+        "List every amenity in the structured amenity fields, not just the description"
+    ],
+    "high_priority_actions": [
+        "Expand the description to 250+ words covering layout, upgrades and location",
+        "Syndicate the listing to Zillow, Zumper, HotPads, Realtor.com, Redfin and Trulia",
+        "Refresh the listing weekly (price, photos or description) to stay near the top of results"
+    ],
+    "site_specific_tips": {
+        "Zillow": ["Use 15+ photos and add a 3D tour", "Keep pricing and availability date current"],
+        "Zumper": ["Respond to leads quickly to improve ranking", "Fill in pet policy and lease terms"],
+        "HotPads": ["Set an accurate map location", "Highlight transit and neighborhood amenities"],
+        "Realtor.com": ["Complete all property detail fields", "Add a virtual tour link"],
+        "Redfin": ["Use a clear, descriptive headline", "Include square footage and parking details"],
+        "Trulia": ["Describe the neighborhood and commute", "Feature lifestyle amenities in the first photos"]
+    }
+}
 
 
 class OpenAIAnalyzer:
-    def __init__(self, api_key: str):
-        self.client = OpenAI(api_key=api_key)
+    def __init__(self, api_key: str, redis_url: Optional[str] = None):
+        # Retries are handled by _with_backoff so rate limits back off exponentially
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            max_retries=0,
+            http_client=httpx.AsyncClient(http2=True, limits=httpx.Limits(max_connections=50))
+        )
         self.model = "gpt-4.1-mini"  # Supported model
+        self.embedding_model = "text-embedding-3-small"
+        self.max_output_tokens = 800
+        
+        # Token accounting for the prompt budget (None if unavailable). Loading the encoding
+        # reads/downloads its BPE file, so it happens here rather than on the event loop
+        try:
+            # tiktoken has no mapping for gpt-4.1 models; they use o200k_base
+            self._encoding = tiktoken.get_encoding("o200k_base")
+            self._system_tokens = len(self._encoding.encode(SYSTEM_PROMPT))
+        except Exception as e:
+            logger.warning("Token counting unavailable, skipping budget check: %s", e)
+            self._encoding = None
+            self._system_tokens = 0
+        
+        # Bound in-flight OpenAI requests to stay under TPM limits
+        self._sem = asyncio.Semaphore(10)
+        self.max_attempts = 5
+        
+        # Semantic cache is optional - only enabled when Redis is configured
+        self.cache = SemanticCache(redis_url) if redis_url else None
+    
+    async def aclose(self):
+        """Release the pooled OpenAI HTTP/2 connections and the semantic cache's Redis pool"""
+        await self.client.close()
+        if self.cache is not None:
+            await self.cache.aclose()
     
-    def analyze_listing_seo(
+    async def analyze_listing_seo(
         self,
         address: str,
         title: str,
@@ -24,90 +152,353 @@ class OpenAIAnalyzer:
         amenities: List[str],
         photos_count: int,
         syndication_results: Dict,
-        market_data: Dict
+        market_data: Dict,
+        use_cache: bool = True
     ) -> Dict:
         """
         Generate SEO recommendations for a listing
         
+        Args:
+            use_cache: Look up / store results in the semantic cache
+        
         Returns:
             Dict with SEO analysis and recommendations
         """
+        default = self.no_context_recommendations(
+            description, amenities, photos_count, syndication_results, market_data
+        )
+        if default is not None:
+            return default
+        
         try:
-            # Build context for AI
-            context = self._build_context(
+            # Check cache: exact key first, then nearest embedding
+            cache_key = None
+            embedding = None
+            if use_cache and self.cache:
+                cache_key = self._build_cache_key(
+                    address, price, bedrooms, bathrooms, square_footage,
+                    amenities, photos_count, syndication_results
+                )
+                try:
+                    cached = await self.cache.get_exact(cache_key)
+                    if cached is None:
+                        embedding = await self._embed(cache_key)
+                        cached = await self.cache.lookup(embedding)
+                    if cached is not None:
+                        logger.info("SEO recommendations served from semantic cache")
+                        return cached
+                except Exception as e:
+                    logger.warning("Semantic cache lookup error: %s", e)
+            
+            # Build context for AI, trimmed to fit the token budget
+            context = self._prepare_context(
                 address, title, description, price, bedrooms, bathrooms,
                 square_footage, amenities, photos_count, syndication_results, market_data
             )
             
             # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._get_system_prompt()
-                    },
-                    {
-                        "role": "user",
-                        "content": context
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=2000,
-                response_format={"type": "json_object"}
+            response = await self._with_backoff(
+                self.client.chat.completions.create,
+                **self._completion_params(context)
             )
             
+            # Only non-zero if the prompt ever grows past the prompt caching threshold
+            details = getattr(response.usage, "prompt_tokens_details", None)
+            cached_tokens = getattr(details, "cached_tokens", 0) or 0
+            if cached_tokens:
+                logger.debug("OpenAI prompt cache hit: %d/%d prompt tokens", cached_tokens, response.usage.prompt_tokens)
+            
             # Parse response
-            result = json.loads(response.choices[0].message.content)
+            analysis = self._parse_analysis(response.choices[0].message.content)
             
-            return {
-                "success": True,
-                **result
-            }
+            if cache_key is not None:
+                try:
+                    await self.cache.store(cache_key, embedding, analysis)
+                except Exception as e:
+                    logger.warning("Semantic cache store error: %s", e)
+            
+            return analysis
         
         except Exception as e:
-            print(f"OpenAI API error: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "overall_seo_score": 50,
-                "quick_wins": ["Error generating recommendations"],
-                "high_priority_actions": [],
-                "site_specific_tips": {}
+            logger.error("OpenAI API error: %s", e)
+            return self._error_result(str(e))
+    
+    def no_context_recommendations(
+        self,
+        description: str,
+        amenities: List[str],
+        photos_count: int,
+        syndication_results: Dict,
+        market_data: Dict
+    ) -> Optional[Dict]:
+        """
+        Default recommendations when there is no market/syndication context
+        
+        Without comparables (or syndication) the model can only give generic
+        advice, so callers skip the OpenAI request entirely.
+        
+        Returns:
+            Default analysis, or None when the listing should go to OpenAI
+        """
+        total_similar = market_data.get("market_stats", {}).get("total_similar_listings", 0)
+        if total_similar == 0 or syndication_results.get("total_sites_found") == 0:
+            logger.info("No market/syndication context - returning default SEO recommendations")
+            return self._default_recommendations(description, amenities, photos_count)
+        return None
+    
+    def build_batch_request(
+        self,
+        custom_id: str,
+        address: str,
+        title: str,
+        description: str,
+        price: int,
+        bedrooms: int,
+        bathrooms: float,
+        square_footage: int,
+        amenities: List[str],
+        photos_count: int,
+        syndication_results: Dict,
+        market_data: Dict
+    ) -> Dict:
+        """
+        Build one Batch API input line for a listing
+        
+        Uses the same prompt and parameters as analyze_listing_seo
+        """
+        context = self._prepare_context(
+            address, title, description, price, bedrooms, bathrooms,
+            square_footage, amenities, photos_count, syndication_results, market_data
+        )
+        
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": self._completion_params(context)
+        }
+    
+    async def submit_batch(self, batch_requests: List[Dict]) -> str:
+        """
+        Upload batch requests as JSONL and start an OpenAI batch
+        
+        Returns:
+            Batch ID
+        """
+        jsonl = b"\n".join(orjson.dumps(r) for r in batch_requests)
+        
+        input_file = await self._with_backoff(
+            self.client.files.create,
+            file=("seo_batch.jsonl", jsonl),
+            purpose="batch"
+        )
+        batch = await self._with_backoff(
+            self.client.batches.create,
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        
+        return batch.id
+    
+    async def get_batch_results(self, batch_id: str, custom_ids: List[str]) -> Optional[Dict[str, Dict]]:
+        """
+        Collect results of a finished batch
+        
+        Args:
+            batch_id: OpenAI batch ID
+            custom_ids: IDs of the requests submitted in the batch
+        
+        Returns:
+            None while the batch is still running, otherwise a dict of
+            custom_id -> analysis (error results for failed requests)
+        """
+        batch = await self._with_backoff(self.client.batches.retrieve, batch_id=batch_id)
+        
+        if batch.status in ("validating", "in_progress", "finalizing", "cancelling"):
+            return None
+        
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            
+            content = await self._with_backoff(self.client.files.content, file_id=file_id)
+            for line in content.content.splitlines():
+                if not line.strip():
+                    continue
+                
+                record = orjson.loads(line)
+                response = record.get("response") or {}
+                
+                try:
+                    if response.get("status_code") == 200:
+                        message = response["body"]["choices"][0]["message"]["content"]
+                        results[record["custom_id"]] = self._parse_analysis(message)
+                    else:
+                        error = record.get("error") or response.get("body", {}).get("error")
+                        results[record["custom_id"]] = self._error_result(str(error))
+                except Exception as e:
+                    results[record["custom_id"]] = self._error_result(str(e))
+        
+        # Requests missing from both files (failed/expired batch)
+        for custom_id in custom_ids:
+            results.setdefault(custom_id, self._error_result(f"No result in batch ({batch.status})"))
+        
+        return results
+    
+    def _prepare_context(
+        self,
+        address: str,
+        title: str,
+        description: str,
+        price: int,
+        bedrooms: int,
+        bathrooms: float,
+        square_footage: int,
+        amenities: List[str],
+        photos_count: int,
+        syndication_results: Dict,
+        market_data: Dict
+    ) -> str:
+        """Build context for OpenAI, trimmed to fit the token budget"""
+        context = self._build_context(
+            address, title, description, price, bedrooms, bathrooms,
+            square_footage, amenities, photos_count, syndication_results, market_data
+        )
+        # desc and the amenity count are capped by _build_context; the free-text fields
+        # that are not (title, address, each amenity) get halved until the prompt fits
+        amenities = amenities[:MAX_AMENITIES]
+        while not self._fits_budget(context):
+            longest = max(len(title), len(address), *(len(a) for a in amenities), 0)
+            if longest <= MIN_FIELD_CHARS:
+                break
+            limit = max(longest // 2, MIN_FIELD_CHARS)
+            title = title[:limit]
+            address = address[:limit]
+            amenities = [a[:limit] for a in amenities]
+            context = self._build_context(
+                address, title, description, price, bedrooms, bathrooms,
+                square_footage, amenities, photos_count, syndication_results, market_data
+            )
+            logger.debug("Trimmed SEO context to fit token budget: title/address/amenities capped at %d chars", limit)
+        
+        return context
+    
+    def _completion_params(self, context: str) -> Dict:
+        """Chat completion parameters shared by real-time and batch requests"""
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": context
+                }
+            ],
+            "temperature": 0.7,
+            "max_tokens": self.max_output_tokens,
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "seo",
+                    "schema": SEO_RESPONSE_SCHEMA,
+                    "strict": True
+                }
             }
+        }
     
-    def _get_system_prompt(self) -> str:
-        """Get system prompt for OpenAI"""
-        return """You are an expert SEO analyst specializing in rental property listings. 
-Your job is to analyze rental listings and provide actionable SEO recommendations to improve visibility on major rental sites like Zillow, Zumper, HotPads, Realtor.com, Redfin, and Trulia.
-
-You must respond with a JSON object containing:
-{
-  "overall_seo_score": 0-100,
-  "quick_wins": ["action 1", "action 2", "action 3"],
-  "high_priority_actions": ["action 1", "action 2", "action 3"],
-  "site_specific_tips": {
-    "Zillow": ["tip 1", "tip 2"],
-    "Zumper": ["tip 1", "tip 2"],
-    "HotPads": ["tip 1", "tip 2"],
-    "Realtor.com": ["tip 1", "tip 2"],
-    "Redfin": ["tip 1", "tip 2"],
-    "Trulia": ["tip 1", "tip 2"]
-  },
-  "site_scores": {
-    "Zillow": 0-100,
-    "Zumper": 0-100,
-    "HotPads": 0-100,
-    "Realtor.com": 0-100,
-    "Redfin": 0-100,
-    "Trulia": 0-100
-  }
-}
-
-Quick wins should be actions that take less than 30 minutes.
-High priority actions should have the biggest impact on visibility.
-Site-specific tips should be tailored to each platform's ranking algorithm.
-Site scores should reflect how well optimized the listing is for each specific site."""
+    def _parse_analysis(self, content: str) -> Dict:
+        """Parse model output into an analysis result"""
+        return {
+            "success": True,
+            **orjson.loads(content)
+        }
+    
+    def _default_recommendations(self, description: str, amenities: List[str], photos_count: int) -> Dict:
+        """Static recommendations with a rule-based score (no LLM call)"""
+        # Photos up to 40 pts (20+ photos), description up to 35 (250+ words), amenities up to 25 (10+)
+        score = round(
+            min(photos_count, 20) * 2
+            + min(len(description.split()) / 250, 1) * 35
+            + min(len(amenities), 10) * 2.5
+        )
+        
+        return {
+            "success": True,
+            "source": "default",
+            **copy.deepcopy(DEFAULT_RECOMMENDATIONS),
+            "overall_seo_score": score,
+            "site_scores": {site: score for site in DEFAULT_RECOMMENDATIONS["site_specific_tips"]}
+        }
+    
+    def _error_result(self, error: str) -> Dict:
+        """Fallback analysis returned when OpenAI fails"""
+        return {
+            "success": False,
+            "error": error,
+            "overall_seo_score": 50,
+            "quick_wins": ["Error generating recommendations"],
+            "high_priority_actions": [],
+            "site_specific_tips": {}
+        }
+    
+    def _build_cache_key(
+        self,
+        address: str,
+        price: int,
+        bedrooms: int,
+        bathrooms: float,
+        square_footage: int,
+        amenities: List[str],
+        photos_count: int,
+        syndication_results: Dict
+    ) -> str:
+        """Build canonical cache-key text from bucketed listing fields"""
+        zip_match = re.search(r"\b\d{5}\b", address)
+        
+        return "|".join([
+            f"br={bedrooms}",
+            f"ba={bathrooms}",
+            f"price={round(price / 100) * 100}",
+            f"sqft={round(square_footage / 250) * 250}",
+            f"amenities={','.join(sorted(a.strip().lower() for a in amenities))}",
+            f"photos={min(photos_count // 5 * 5, 30)}",
+            f"zip={zip_match.group(0) if zip_match else ''}",
+            f"sites={syndication_results.get('total_sites_found', 0)}"
+        ])
+    
+    async def _embed(self, text: str) -> List[float]:
+        """Embed text for semantic cache lookups"""
+        response = await self._with_backoff(
+            self.client.embeddings.create, model=self.embedding_model, input=text
+        )
+        return response.data[0].embedding
+    
+    def _fits_budget(self, context: str) -> bool:
+        """Check system + user + output tokens fit the model context window"""
+        if self._encoding is None:
+            return True
+        
+        user_tokens = len(self._encoding.encode(context))
+        return self._system_tokens + user_tokens + self.max_output_tokens <= MAX_CONTEXT_TOKENS
+    
+    async def _with_backoff(self, create, **kwargs):
+        """Call an OpenAI endpoint under the concurrency limit, retrying with exponential backoff"""
+        for attempt in range(self.max_attempts):
+            try:
+                async with self._sem:
+                    return await create(**kwargs)
+            # Same transient errors the SDK retries itself (429, 409, 5xx, timeouts, connection)
+            except (RateLimitError, ConflictError, InternalServerError, APITimeoutError, APIConnectionError) as e:
+                if attempt == self.max_attempts - 1:
+                    raise
+                delay = 2 ** attempt + random.random()
+                logger.info("OpenAI request failed (%s), retrying in %.1fs", e.__class__.__name__, delay)
+                await asyncio.sleep(delay)
     
     def _build_context(
         self,
@@ -123,49 +514,31 @@ Site scores should reflect how well optimized the listing is for each specific s
         syndication_results: Dict,
         market_data: Dict
     ) -> str:
-        """Build context string for OpenAI"""
+        """Build compact JSON context for OpenAI"""
         
         # Calculate market positioning
-        market_avg_rent = market_data.get("market_stats", {}).get("market_avg_rent", 0)
+        market_stats = market_data.get("market_stats", {})
+        market_avg_rent = market_stats.get("market_avg_rent", 0)
         rent_vs_market = ((price - market_avg_rent) / market_avg_rent * 100) if market_avg_rent > 0 else 0
         
-        context = f"""Analyze this rental listing for SEO optimization:
-
-LISTING DETAILS:
-- Address: {address}
-- Title: {title}
-- Description: {description[:500]}... (truncated)
-- Price: ${price}/month
-- Bedrooms: {bedrooms}
-- Bathrooms: {bathrooms}
-- Square Footage: {square_footage} sq ft
-- Price per sq ft: ${round(price / square_footage, 2) if square_footage > 0 else 0}
-- Amenities: {', '.join(amenities[:10])}
-- Photos: {photos_count}
-
-SYNDICATION STATUS:
-- Found on {syndication_results.get('total_sites_found', 0)}/27 sites
-- Top 6 sites: {syndication_results.get('top_6_found_count', 0)}/6 found
-- Missing from: {', '.join(syndication_results.get('sites_not_found', [])[:5])}
-
-MARKET ANALYSIS:
-- Market average rent: ${market_avg_rent}
-- Your rent vs market: {rent_vs_market:+.1f}%
-- Market average DOM: {market_data.get('market_stats', {}).get('market_avg_dom', 0)} days
-- Similar listings: {market_data.get('market_stats', {}).get('total_similar_listings', 0)}
-
-Provide SEO recommendations focusing on:
-1. Quick wins (< 30 min) to improve visibility immediately
-2. High priority actions with biggest impact
-3. Site-specific optimization for Zillow, Zumper, HotPads, Realtor.com, Redfin, Trulia
-4. SEO scores for each site (0-100)
-
-Consider:
-- Photo quality and quantity (Zillow loves 15+ photos)
-- Title optimization (keywords, location, amenities)
-- Description length and quality (250+ words performs better)
-- Pricing strategy vs market
-- Amenity highlighting
-- Freshness (recent updates boost rankings)"""
+        context = {
+            "addr": address,
+            "title": title,
+            "desc": description[:MAX_DESCRIPTION_CHARS],
+            "price": price,
+            "br": bedrooms,
+            "ba": bathrooms,
+            "sqft": square_footage,
+            "ppsf": round(price / square_footage, 2) if square_footage > 0 else 0,
+            "amen": amenities[:MAX_AMENITIES],
+            "photos": photos_count,
+            "sites_found": syndication_results.get("total_sites_found", 0),
+            "top6_found": syndication_results.get("top_6_found_count", 0),
+            "missing": syndication_results.get("sites_not_found", [])[:5],
+            "mkt_rent": market_avg_rent,
+            "vs_mkt": round(rent_vs_market, 1),
+            "mkt_dom": market_stats.get("market_avg_dom", 0),
+            "comps": market_stats.get("total_similar_listings", 0)
+        }
         
-        return context
+        return orjson.dumps(context).decode()
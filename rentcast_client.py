@@ -3,11 +3,41 @@ RentCast API Client
 Fetches market data and comparable properties
 """
 import os
-import requests
-from typing import Dict, List, Optional
+import asyncio
+import httpx
+import logging
+import numpy as np
+from cachetools import TTLCache
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 
+# Child of the service logger; silent unless the app configures handlers
+logger = logging.getLogger("leasing.rentcast")
+logger.addHandler(logging.NullHandler())
+
+# Transient RentCast responses worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3
+
+# RentCast listing status -> market stats group
+STATUS_GROUPS = {
+    "Active": "active",
+    "For Rent": "active",
+    "Rented": "rented",
+    "Leased": "rented"
+}
+
+
+def _median(values: np.ndarray) -> int:
+    """Upper median via partition (O(n)); same int value as sorted(values)[n // 2]"""
+    if not len(values):
+        return 0
+    mid = len(values) // 2
+    return int(np.partition(values, mid)[mid])
+
+
 class RentCastClient:
     def __init__(self, api_key: str):
         self.api_key = api_key
@@ -16,8 +46,21 @@ class RentCastClient:
             "X-Api-Key": self.api_key,
             "Content-Type": "application/json"
         }
+        # Shared client so both RentCast endpoints reuse pooled connections
+        self.client = httpx.AsyncClient(
+            timeout=30,
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=MAX_RETRIES,  # connect errors; status retries live in _get
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        )
+        
+        # Raw RentCast responses per market bucket, shared by /analyze-market and /check-syndication
+        self._cache = TTLCache(maxsize=4096, ttl=6 * 3600)
+        self._locks: Dict[Tuple, asyncio.Lock] = {}
     
-    def get_market_data(
+    async def get_market_data(
         self,
         address: str,
         bedrooms: int,
@@ -41,13 +84,29 @@ class RentCastClient:
             Dict with market analysis data
         """
         try:
-            # Get rent estimate
-            rent_estimate = self._get_rent_estimate(address)
+            key = self._cache_key(address, bedrooms, bathrooms, property_type, radius)
+            cached = self._cache.get(key)
             
-            # Get comparable properties
-            comparables = self._get_comparables(
-                address, bedrooms, bathrooms, square_footage, property_type, radius
-            )
+            if cached is None:
+                # One fetch per cold key; concurrent callers wait and reuse it
+                lock = self._locks.setdefault(key, asyncio.Lock())
+                try:
+                    async with lock:
+                        cached = self._cache.get(key)
+                        if cached is None:
+                            cached = await self._fetch_market(
+                                address, bedrooms, bathrooms, square_footage, property_type, radius
+                            )
+                            rent_estimate, comparables = cached
+                            # Only cache when both endpoints returned data
+                            if rent_estimate is not None and comparables:
+                                self._cache[key] = cached
+                finally:
+                    # A later caller may already have installed a fresh lock for this key
+                    if self._locks.get(key) is lock:
+                        del self._locks[key]
+            
+            rent_estimate, comparables = cached
             
             # Calculate market statistics
             market_stats = self._calculate_market_stats(comparables, square_footage)
@@ -66,25 +125,62 @@ class RentCastClient:
                 "error": str(e)
             }
     
-    def _get_rent_estimate(self, address: str) -> Optional[Dict]:
+    def _cache_key(
+        self,
+        address: str,
+        bedrooms: int,
+        bathrooms: float,
+        property_type: str,
+        radius: float
+    ) -> Tuple:
+        """Build market cache key (bathrooms bucketed to the nearest half)"""
+        normalized_address = " ".join(address.lower().split())
+        return (normalized_address, bedrooms, round(bathrooms * 2) / 2, property_type, round(radius, 1))
+    
+    async def _fetch_market(
+        self,
+        address: str,
+        bedrooms: int,
+        bathrooms: float,
+        square_footage: int,
+        property_type: str,
+        radius: float
+    ) -> Tuple[Optional[Dict], List[Dict]]:
+        """Fetch rent estimate and comparables concurrently"""
+        return await asyncio.gather(
+            self._get_rent_estimate(address),
+            self._get_comparables(
+                address, bedrooms, bathrooms, square_footage, property_type, radius
+            )
+        )
+    
+    async def _get(self, endpoint: str, params: Dict) -> httpx.Response:
+        """GET on the shared client, retrying 429/5xx responses with exponential backoff"""
+        for attempt in range(MAX_RETRIES + 1):
+            response = await self.client.get(endpoint, headers=self.headers, params=params)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+    
+    async def _get_rent_estimate(self, address: str) -> Optional[Dict]:
         """Get rent estimate for an address"""
         try:
             endpoint = f"{self.base_url}/avm/rent/long-term"
             params = {"address": address}
             
-            response = requests.get(endpoint, headers=self.headers, params=params, timeout=30)
+            response = await self._get(endpoint, params)
             
             if response.status_code == 200:
                 return response.json()
             else:
-                print(f"RentCast rent estimate error: {response.status_code} - {response.text}")
+                logger.error("RentCast rent estimate error: %s - %s", response.status_code, response.text)
                 return None
         
         except Exception as e:
-            print(f"Error getting rent estimate: {e}")
+            logger.exception("Error getting rent estimate: %s", e)
             return None
     
-    def _get_comparables(
+    async def _get_comparables(
         self,
         address: str,
         bedrooms: int,
@@ -106,18 +202,18 @@ class RentCastClient:
                 "limit": 50
             }
             
-            response = requests.get(endpoint, headers=self.headers, params=params, timeout=30)
+            response = await self._get(endpoint, params)
             
             if response.status_code == 200:
                 data = response.json()
                 # Response is a list of listings, not a dict with comparables
                 return data if isinstance(data, list) else []
             else:
-                print(f"RentCast comparables error: {response.status_code} - {response.text}")
+                logger.error("RentCast comparables error: %s - %s", response.status_code, response.text)
                 return []
         
         except Exception as e:
-            print(f"Error getting comparables: {e}")
+            logger.exception("Error getting comparables: %s", e)
             return []
     
     def _calculate_market_stats(self, comparables: List[Dict], listing_sqft: int) -> Dict:
@@ -142,31 +238,38 @@ class RentCastClient:
                 "avg_dom_rented": 0
             }
         
-        # Separate active and rented listings
-        active_listings = [c for c in comparables if c.get("status") in ["Active", "For Rent"]]
-        rented_listings = [c for c in comparables if c.get("status") in ["Rented", "Leased"]]
-        
-        # Extract rents and DOMs
-        all_rents = [c.get("price", 0) for c in comparables if c.get("price")]
-        all_doms = [c.get("daysOnMarket", 0) for c in comparables if c.get("daysOnMarket")]
-        
-        active_rents = [c.get("price", 0) for c in active_listings if c.get("price")]
-        rented_rents = [c.get("price", 0) for c in rented_listings if c.get("price")]
+        # Single grouping pass; zero/missing rents and DOMs are skipped
+        groups = {name: {"rents": [], "doms": [], "count": 0} for name in ("all", "active", "rented")}
+        for c in comparables:
+            price = c.get("price")
+            dom = c.get("daysOnMarket")
+            status_group = STATUS_GROUPS.get(c.get("status"))
+            
+            for group in (groups["all"], groups[status_group]) if status_group else (groups["all"],):
+                group["count"] += 1
+                if price:
+                    group["rents"].append(price)
+                if dom:
+                    group["doms"].append(dom)
         
-        active_doms = [c.get("daysOnMarket", 0) for c in active_listings if c.get("daysOnMarket")]
-        rented_doms = [c.get("daysOnMarket", 0) for c in rented_listings if c.get("daysOnMarket")]
+        all_rents = np.array(groups["all"]["rents"], dtype=np.int64)
+        all_doms = np.array(groups["all"]["doms"], dtype=np.int64)
+        active_rents = np.array(groups["active"]["rents"], dtype=np.int64)
+        rented_rents = np.array(groups["rented"]["rents"], dtype=np.int64)
+        active_doms = np.array(groups["active"]["doms"], dtype=np.int64)
+        rented_doms = np.array(groups["rented"]["doms"], dtype=np.int64)
         
         # Calculate averages
-        market_avg_rent = sum(all_rents) // len(all_rents) if all_rents else 0
-        market_median_rent = sorted(all_rents)[len(all_rents) // 2] if all_rents else 0
-        market_avg_dom = sum(all_doms) // len(all_doms) if all_doms else 0
-        market_median_dom = sorted(all_doms)[len(all_doms) // 2] if all_doms else 0
+        market_avg_rent = int(all_rents.sum() // all_rents.size) if all_rents.size else 0
+        market_median_rent = _median(all_rents)
+        market_avg_dom = int(all_doms.sum() // all_doms.size) if all_doms.size else 0
+        market_median_dom = _median(all_doms)
         
-        avg_rent_active = sum(active_rents) // len(active_rents) if active_rents else 0
-        avg_rent_rented = sum(rented_rents) // len(rented_rents) if rented_rents else 0
+        avg_rent_active = int(active_rents.sum() // active_rents.size) if active_rents.size else 0
+        avg_rent_rented = int(rented_rents.sum() // rented_rents.size) if rented_rents.size else 0
         
-        avg_dom_active = sum(active_doms) // len(active_doms) if active_doms else 0
-        avg_dom_rented = sum(rented_doms) // len(rented_doms) if rented_doms else 0
+        avg_dom_active = int(active_doms.sum() // active_doms.size) if active_doms.size else 0
+        avg_dom_rented = int(rented_doms.sum() // rented_doms.size) if rented_doms.size else 0
         
         # Calculate rent per sqft
         market_avg_rent_per_sqft = round(market_avg_rent / listing_sqft, 2) if listing_sqft > 0 else 0
@@ -176,14 +279,14 @@ class RentCastClient:
         return {
             "market_avg_rent": market_avg_rent,
             "market_median_rent": market_median_rent,
-            "market_rent_range_low": min(all_rents) if all_rents else 0,
-            "market_rent_range_high": max(all_rents) if all_rents else 0,
+            "market_rent_range_low": int(all_rents.min()) if all_rents.size else 0,
+            "market_rent_range_high": int(all_rents.max()) if all_rents.size else 0,
             "market_avg_rent_per_sqft": market_avg_rent_per_sqft,
             "market_avg_dom": market_avg_dom,
             "market_median_dom": market_median_dom,
             "total_similar_listings": len(comparables),
-            "active_listings_count": len(active_listings),
-            "rented_listings_count": len(rented_listings),
+            "active_listings_count": groups["active"]["count"],
+            "rented_listings_count": groups["rented"]["count"],
             "avg_rent_active": avg_rent_active,
             "avg_rent_rented": avg_rent_rented,
             "avg_rent_per_sqft_active": avg_rent_per_sqft_active,
@@ -0,0 +1,122 @@
+"""
+Semantic Cache
+Redis vector-search cache for OpenAI SEO recommendations
+"""
+import redis
+import redis.asyncio
+from redis.commands.search.field import TextField, VectorField
+from redis.commands.search.indexDefinition import IndexDefinition, IndexType
+from redis.commands.search.query import Query
+from typing import Dict, List, Optional
+import hashlib
+import orjson
+import struct
+import uuid
+
+
+class SemanticCache:
+    def __init__(
+        self,
+        redis_url: str,
+        index_name: str = "seo_cache",
+        dimensions: int = 1536,
+        distance_threshold: float = 0.05,
+        ttl: int = 7 * 24 * 3600
+    ):
+        """
+        Initialize semantic cache
+
+        Args:
+            redis_url: Redis connection URL (requires RediSearch)
+            index_name: Name of the vector index
+            dimensions: Embedding vector size (text-embedding-3-small = 1536)
+            distance_threshold: Max COSINE distance counted as a hit
+            ttl: Seconds before cached entries expire (default 7 days)
+        """
+        self.redis = redis.asyncio.Redis.from_url(redis_url)
+        self.index_name = index_name
+        self.prefix = f"{index_name}:"
+        self.dimensions = dimensions
+        self.distance_threshold = distance_threshold
+        self.ttl = ttl
+        self._index_ready = False
+
+    async def get_exact(self, canonical: str) -> Optional[Dict]:
+        """Return the cached result stored under the exact canonical key, if any"""
+        value = await self.redis.get(self._exact_key(canonical))
+        return orjson.loads(value) if value is not None else None
+
+    async def lookup(self, embedding: List[float]) -> Optional[Dict]:
+        """Return the cached result for the nearest embedding, if close enough"""
+        await self._ensure_index()
+
+        query = (
+            Query("*=>[KNN 1 @embedding $vec AS distance]")
+            .sort_by("distance")
+            .return_fields("distance", "json_result")
+            .dialect(2)
+        )
+        results = await self.redis.ft(self.index_name).search(
+            query, query_params={"vec": self._to_bytes(embedding)}
+        )
+
+        if not results.docs:
+            return None
+
+        doc = results.docs[0]
+        if float(doc.distance) >= self.distance_threshold:
+            return None
+
+        return orjson.loads(doc.json_result)
+
+    async def store(self, canonical: str, embedding: Optional[List[float]], result: Dict) -> None:
+        """Store a result under its exact key and, when embedded, its vector"""
+        json_result = orjson.dumps(result)
+        pipe = self.redis.pipeline()
+        pipe.set(self._exact_key(canonical), json_result, ex=self.ttl)
+
+        if embedding is not None:
+            await self._ensure_index()
+            key = f"{self.prefix}{uuid.uuid4().hex}"
+            pipe.hset(key, mapping={
+                "embedding": self._to_bytes(embedding),
+                "json_result": json_result
+            })
+            pipe.expire(key, self.ttl)
+
+        await pipe.execute()
+
+    async def aclose(self) -> None:
+        """Close the Redis connection pool"""
+        await self.redis.aclose()
+
+    async def _ensure_index(self) -> None:
+        """Create the vector index on first use"""
+        if self._index_ready:
+            return
+
+        try:
+            await self.redis.ft(self.index_name).info()
+        except redis.ResponseError:
+            await self.redis.ft(self.index_name).create_index(
+                [
+                    VectorField("embedding", "HNSW", {
+                        "TYPE": "FLOAT32",
+                        "DIM": self.dimensions,
+                        "DISTANCE_METRIC": "COSINE"
+                    }),
+                    TextField("json_result")
+                ],
+                definition=IndexDefinition(prefix=[self.prefix], index_type=IndexType.HASH)
+            )
+
+        self._index_ready = True
+
+    def _exact_key(self, canonical: str) -> str:
+        """Exact-match key: SHA256 of the canonical cache-key text"""
+        return f"{self.index_name}_exact:" + hashlib.sha256(canonical.encode()).hexdigest()
+
+    @staticmethod
+    def _to_bytes(embedding: List[float]) -> bytes:
+        """Pack an embedding as FLOAT32 bytes for RediSearch"""
+        return struct.pack(f"{len(embedding)}f", *embedding)
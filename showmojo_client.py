@@ -11,10 +11,99 @@ ShowMojo API Client with Debug Logging
 Fetches showing data from ShowMojo using the Report Export API
 """
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from itertools import chain
+from dataclasses import dataclass
+from urllib.parse import quote
+from typing import Any, Optional, Dict, List
+import io
+import ijson
+from ijson.common import ObjectBuilder
 import json
+import logging
+import orjson
+import time
+
+
+# Child of the service logger; silent unless the app (or __main__) configures handlers
+logger = logging.getLogger("leasing.showmojo")
+logger.addHandler(logging.NullHandler())
+
+# Prefer the C (yajl2) parser when it is built
+try:
+    _ijson = ijson.get_backend("yajl2_c")
+except ImportError:
+    _ijson = ijson
+
+
+# Report export takes form-encoded POST bodies
+_CONTENT_TYPE_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# Top-level keys that may hold the showing list when there is no "response" envelope
+_LIST_KEYS = ("data", "showings", "results", "rows", "report_data")
+
+# Responses at least this large (or of unknown size) are parsed incrementally
+STREAM_THRESHOLD_BYTES = 1024 * 1024
+
+# Pooled connections per host, also the cap on concurrent range requests
+POOL_MAXSIZE = 20
+
+# Seconds a successful auth check is trusted by test_connection
+AUTH_CACHE_SECONDS = 300
+
+# Output field -> raw ShowMojo keys, in order of preference
+_FIELD_ALIASES = (
+    ("showing_id", ("id", "showing_id")),
+    ("property_id", ("listing_uid", "property_id", "listing_id")),
+    ("property_address", ("showing_address_and_unit", "property_address", "address")),
+    ("prospect_name", ("name", "prospect_name", "contact_name")),
+    ("prospect_email", ("email", "prospect_email", "contact_email")),
+    ("prospect_phone", ("phone", "prospect_phone", "contact_phone")),
+    ("status", ("status",)),
+    ("confirmed", ("confirmed",)),
+    ("attended", ("attended",)),
+    ("cancelled", ("cancelled",)),
+    ("no_show", ("no_show",)),
+    ("notes", ("notes", "comments")),
+    ("created_at", ("created_at", "created")),
+    ("updated_at", ("updated_at", "updated")),
+)
+
+
+@dataclass(slots=True)
+class Showing:
+    """Compact record for one ShowMojo showing"""
+    showing_id: Any = None
+    property_id: Any = None
+    property_address: Optional[str] = None
+    prospect_name: Optional[str] = None
+    prospect_email: Optional[str] = None
+    prospect_phone: Optional[str] = None
+    showing_date: Optional[str] = None
+    showing_time: Optional[str] = None
+    showing_datetime: Optional[str] = None
+    status: str = "unknown"
+    confirmed: bool = False
+    attended: Optional[bool] = None
+    cancelled: bool = False
+    no_show: bool = False
+    notes: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    
+    def to_dict(self) -> Dict:
+        """Plain dict for JSON boundaries that need mapping access"""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+def _preview(data, limit: int = 1000) -> str:
+    """Compact JSON preview of data, truncated to limit characters"""
+    s = json.dumps(data, default=str)
+    return s if len(s) <= limit else s[:limit] + "...(truncated)"
 
 
 class ShowMojoClient:
@@ -31,6 +120,38 @@ class ShowMojoClient:
         self.email = email
         self.password = password
         self.base_url = "https://showmojo.com/api/v3"
+        self._report_url = f"{self.base_url}/reports/prospect_showing_data"
+        
+        # Monotonic time of the last request that proved the credentials work
+        self._auth_verified_at: Optional[float] = None
+        
+        # Persistent session: pooled keep-alive connections, auth set once
+        self.session = requests.Session()
+        self.session.auth = HTTPBasicAuth(email, password)
+        self.session.headers.update(_CONTENT_TYPE_HEADERS)
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=POOL_MAXSIZE,
+            # The report endpoint is a read-only POST, so gateway errors are safe to retry;
+            # the last response is returned as-is and reported by _fetch_window
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=frozenset({"POST"}),
+                raise_on_status=False
+            )
+        ))
+    
+    def close(self):
+        """Release pooled connections"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
     
     def get_showings(self, days_back: int = 30, property_id: Optional[str] = None) -> Dict:
         """
@@ -40,220 +161,356 @@ class ShowMojoClient:
             days_back: Number of days back to fetch data (default: 30)
             property_id: Optional property ID to filter results
         
+        Returns:
+            Dict with success status and showing data
+        """
+        # Calculate date range
+        end_date = date.today()
+        start_date = end_date - timedelta(days=days_back)
+        
+        return self._fetch_window(start_date, end_date, property_id)
+    
+    def get_showings_range(
+        self,
+        start: date,
+        end: date,
+        property_id: Optional[str] = None,
+        chunk_days: int = 7,
+        max_workers: int = 8
+    ) -> Dict:
+        """
+        Fetch showings for a long date range as concurrent date windows
+        
+        Args:
+            start: First day of the range
+            end: Last day of the range
+            property_id: Optional property ID to filter results
+            chunk_days: Days per request window (default: 7)
+            max_workers: Concurrent requests, capped at the session pool size
+        
+        Returns:
+            Dict with success status and showing data
+        """
+        windows = []
+        window_start = start
+        while window_start <= end:
+            window_end = min(window_start + timedelta(days=chunk_days - 1), end)
+            windows.append((window_start, window_end))
+            window_start = window_end + timedelta(days=1)
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, POOL_MAXSIZE)) as executor:
+            futures = [
+                executor.submit(
+                    self._fetch_window, window_start, window_end, property_id,
+                    id_prefix=f"showing_{window_start:%Y%m%d}"
+                )
+                for window_start, window_end in windows
+            ]
+            results = [future.result() for future in as_completed(futures)]
+        
+        failed = next((result for result in results if not result.get("success")), None)
+        if failed is not None:
+            return failed
+        
+        # Merge windows, dropping showings that appear on both sides of a boundary;
+        # fallback IDs carry their window's start date so they never collide
+        showings = []
+        seen = set()
+        for showing in chain.from_iterable(result["showings"] for result in results):
+            if showing.showing_id not in seen:
+                seen.add(showing.showing_id)
+                showings.append(showing)
+        
+        return {
+            "success": True,
+            "sync_timestamp": datetime.now().isoformat(),
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "showings": showings
+        }
+    
+    def _fetch_window(
+        self,
+        start_date: date,
+        end_date: date,
+        property_id: Optional[str] = None,
+        id_prefix: str = "showing"
+    ) -> Dict:
+        """
+        Fetch showings for one explicit date window
+        
+        Args:
+            start_date: First day of the window
+            end_date: Last day of the window
+            property_id: Optional property ID to filter results
+            id_prefix: Prefix for fallback IDs of records without one
+        
         Returns:
             Dict with success status and showing data
         """
         try:
-            # Calculate date range
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days_back)
-            
             # Format dates for API (YYYY-MM-DD)
-            start_date_str = start_date.strftime("%Y-%m-%d")
-            end_date_str = end_date.strftime("%Y-%m-%d")
+            start_date_str = start_date.isoformat()
+            end_date_str = end_date.isoformat()
             
-            # Build API request
-            report_url = f"{self.base_url}/reports/prospect_showing_data"
+            # Pre-encoded form body: ISO dates are URL-safe, so only property_id needs quoting
+            body = f"start_date={start_date_str}&end_date={end_date_str}"
+            if property_id is not None:
+                body += f"&property_id={quote(property_id)}"
             
-            print(f"Fetching ShowMojo data from {start_date_str} to {end_date_str}...")
-            print(f"API URL: {report_url}")
+            logger.info("Fetching ShowMojo data from %s to %s...", start_date_str, end_date_str)
+            logger.debug("API URL: %s", self._report_url)
             
             # ShowMojo uses HTTP Basic Auth directly - no separate login needed!
-            response = requests.post(
-                report_url,
-                auth=HTTPBasicAuth(self.email, self.password),
-                data={
-                    "start_date": start_date_str,
-                    "end_date": end_date_str
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=60
-            )
-            
-            print(f"ShowMojo API Response Status: {response.status_code}")
-            
-            if response.status_code == 200:
-                # DEBUG: Print raw response
-                raw_response = response.text
-                print(f"ShowMojo Raw Response (first 500 chars): {raw_response[:500]}")
+            # Stream the body so showings are parsed one record at a time
+            with self.session.post(
+                self._report_url,
+                data=body.encode("ascii"),
+                timeout=60,
+                stream=True
+            ) as response:
+                logger.debug("ShowMojo API response status: %d", response.status_code)
                 
-                try:
-                    data = response.json()
-                    print(f"ShowMojo Response Type: {type(data)}")
+                if response.status_code == 200:
+                    self._auth_verified_at = time.monotonic()
                     
-                    # DEBUG: Print response structure
-                    if isinstance(data, dict):
-                        print(f"ShowMojo Response Keys: {list(data.keys())}")
-                    elif isinstance(data, list):
-                        print(f"ShowMojo Response is a list with {len(data)} items")
-                        if len(data) > 0:
-                            print(f"First item keys: {list(data[0].keys()) if isinstance(data[0], dict) else 'Not a dict'}")
+                    try:
+                        # Small bodies decode in one orjson pass; large or chunked ones stream
+                        content_length = int(response.headers.get("Content-Length") or 0)
+                        if 0 < content_length < STREAM_THRESHOLD_BYTES:
+                            showings = self._parse_showings(orjson.loads(response.content), id_prefix)
+                        else:
+                            response.raw.decode_content = True
+                            showings = self._parse_showings_stream(response.raw, id_prefix)
+                    except (ijson.JSONError, orjson.JSONDecodeError) as e:
+                        logger.error("ShowMojo response is not JSON: %s", e)
+                        return {
+                            "success": False,
+                            "error": "Invalid JSON response from ShowMojo",
+                            "showings": []
+                        }
                     
-                    # DEBUG: Print full response (be careful with large responses)
-                    print(f"ShowMojo Full Response: {json.dumps(data, indent=2)[:1000]}")
+                    logger.info("Successfully retrieved %d showings from ShowMojo", len(showings))
                     
-                except json.JSONDecodeError as e:
-                    print(f"ShowMojo Response is not JSON: {e}")
-                    print(f"Raw response: {raw_response}")
+                    return {
+                        "success": True,
+                        "sync_timestamp": datetime.now().isoformat(),
+                        "start_date": start_date_str,
+                        "end_date": end_date_str,
+                        "showings": showings
+                    }
+                
+                elif response.status_code == 401:
+                    # Basic auth has no token to refresh, so retrying can't help;
+                    # drop the cached check so test_connection re-probes
+                    self._auth_verified_at = None
+                    logger.error("ShowMojo authentication failed: invalid credentials")
                     return {
                         "success": False,
-                        "error": "Invalid JSON response from ShowMojo",
+                        "error": "Authentication failed - check email/password",
                         "showings": []
                     }
                 
-                showings = self._parse_showings(data)
-                
-                print(f"Successfully retrieved {len(showings)} showings from ShowMojo")
-                
-                return {
-                    "success": True,
-                    "sync_timestamp": datetime.now().isoformat(),
-                    "start_date": start_date_str,
-                    "end_date": end_date_str,
-                    "showings": showings
-                }
-            
-            elif response.status_code == 401:
-                print(f"ShowMojo authentication failed: Invalid credentials")
-                return {
-                    "success": False,
-                    "error": "Authentication failed - check email/password",
-                    "showings": []
-                }
-            
-            else:
-                print(f"ShowMojo API error: {response.status_code}")
-                print(f"Response text: {response.text[:500]}")
-                return {
-                    "success": False,
-                    "error": f"API request failed: {response.status_code}",
-                    "showings": []
-                }
+                else:
+                    logger.error("ShowMojo API error: %d - %s", response.status_code, response.text[:500])
+                    return {
+                        "success": False,
+                        "error": f"API request failed: {response.status_code}",
+                        "showings": []
+                    }
         
         except Exception as e:
-            print(f"Error fetching ShowMojo data: {e}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Error fetching ShowMojo data: %s", e)
             return {
                 "success": False,
                 "error": str(e),
                 "showings": []
             }
     
-    def _parse_showings(self, data: Dict) -> List[Dict]:
+    def _parse_showings(self, data: Dict, id_prefix: str = "showing") -> List[Showing]:
         """
         Parse showing data from API response
         
         Args:
             data: Raw API response data
+            id_prefix: Prefix for fallback IDs of records without one
         
         Returns:
-            List of parsed showing dictionaries
+            List of parsed showings
         """
         showings = []
         
-        print(f"Parsing ShowMojo data...")
-        
         # ShowMojo returns data in this format:
         # {"response": {"status": "success", "data": [...]}}
         
         if isinstance(data, list):
             showing_list = data
-            print(f"Data is a list with {len(showing_list)} items")
         elif isinstance(data, dict):
-            # ShowMojo wraps data in a 'response' object
-            if 'response' in data:
-                response_obj = data['response']
-                if isinstance(response_obj, dict) and 'data' in response_obj:
-                    showing_list = response_obj['data']
-                    print(f"Extracted {len(showing_list)} items from response.data")
-                else:
-                    showing_list = []
-                    print(f"'response' exists but no 'data' key found")
-            else:
-                # Try common keys at top level
-                showing_list = (
-                    data.get("data") or 
-                    data.get("showings") or 
-                    data.get("results") or 
-                    data.get("rows") or
-                    data.get("report_data") or
-                    []
-                )
-                print(f"No 'response' key, extracted {len(showing_list)} items using key search")
-                
-                # If still empty, try to find any list in the dict
-                if not showing_list:
-                    for key, value in data.items():
-                        if isinstance(value, list) and len(value) > 0:
-                            showing_list = value
-                            print(f"Found list in key '{key}' with {len(showing_list)} items")
-                            break
+            # Known ShowMojo envelope first, then common top-level keys, then any list
+            response_obj = data.get("response")
+            showing_list = (
+                (response_obj.get("data") if isinstance(response_obj, dict) else None)
+                or next((data[key] for key in _LIST_KEYS if data.get(key)), None)
+                or next((value for value in data.values() if isinstance(value, list) and value), [])
+            )
         else:
             showing_list = []
-            print(f"Data is neither list nor dict: {type(data)}")
+            logger.warning("ShowMojo data is neither list nor dict: %s", type(data))
         
-        print(f"Processing {len(showing_list)} items...")
+        logger.debug("Processing %d items...", len(showing_list))
         
         for idx, item in enumerate(showing_list):
             if not isinstance(item, dict):
-                print(f"Item {idx} is not a dict: {type(item)}")
+                logger.warning("Item %d is not a dict: %s", idx, type(item))
                 continue
                 
-            # DEBUG: Print first item structure
-            if idx == 0:
-                print(f"DEBUG - First item structure: {json.dumps(item, indent=2)[:500]}")
-            
-            # Parse showtime into separate date and time
-            # Format: "5 Oct 2025, 8:00PM CDT" or "11 Oct 2025, 3:30PM CDT"
-            showtime_raw = item.get("showtime")
-            showing_date = None
-            showing_time = None
-            showing_datetime = None
-            
-            if showtime_raw:
-                try:
-                    # Split by comma: ["5 Oct 2025", " 8:00PM CDT"]
-                    parts = showtime_raw.split(",")
-                    if len(parts) >= 2:
-                        showing_date = parts[0].strip()  # "5 Oct 2025"
-                        showing_time = parts[1].strip()  # "8:00PM CDT"
-                        showing_datetime = showtime_raw  # Keep full string for reference
-                        if idx == 0:
-                            print(f"DEBUG - Parsed showtime: date='{showing_date}', time='{showing_time}'")
-                except Exception as e:
-                    print(f"Warning: Could not parse showtime '{showtime_raw}': {e}")
-                    showing_datetime = showtime_raw
+            showings.append(self._map_item(item, idx, id_prefix))
+        
+        logger.debug("Parsed %d showings", len(showings))
+        return showings
+    
+    def _parse_showings_stream(self, raw, id_prefix: str = "showing") -> List[Showing]:
+        """
+        Incrementally parse showings from a streamed response body
+        
+        Picks the showing list with the same precedence as _parse_showings
+        (bare list, response.data, _LIST_KEYS, then any other top-level list),
+        but maps each record to a Showing as soon as it is parsed instead of
+        building the whole document first.
+        
+        Args:
+            raw: File-like response body
+            id_prefix: Prefix for fallback IDs of records without one
+        
+        Returns:
+            List of parsed showings
+        """
+        raw.auto_close = False  # let BufferedReader see EOF instead of a closed file
+        body = io.BufferedReader(raw)
+        
+        # Candidate list prefix -> [item count, parsed showings, skipped non-dict items]
+        candidates: Dict[str, list] = {}
+        active = None
+        item_prefix = None
+        builder = None
+        depth = 0
+        
+        for prefix, event, value in _ijson.parse(body, use_float=True):
+            if builder is not None:
+                # Inside a record: feed the builder until it closes
+                builder.event(event, value)
+                if event in ("start_map", "start_array"):
+                    depth += 1
+                elif event in ("end_map", "end_array"):
+                    depth -= 1
+                if depth == 0:
+                    self._collect(candidates[active], builder.value, id_prefix)
+                    builder = None
             
-            showing = {
-                "showing_id": item.get("id") or item.get("showing_id") or f"showing_{idx}",
-                "property_id": item.get("listing_uid") or item.get("property_id") or item.get("listing_id"),
-                "property_address": item.get("showing_address_and_unit") or item.get("property_address") or item.get("address"),
-                "prospect_name": item.get("name") or item.get("prospect_name") or item.get("contact_name"),
-                "prospect_email": item.get("email") or item.get("prospect_email") or item.get("contact_email"),
-                "prospect_phone": item.get("phone") or item.get("prospect_phone") or item.get("contact_phone"),
-                "showing_date": showing_date,
-                "showing_time": showing_time,
-                "showing_datetime": showing_datetime,
-                "status": item.get("status") or "unknown",
-                "confirmed": item.get("confirmed", False),
-                "attended": item.get("attended"),
-                "cancelled": item.get("cancelled", False),
-                "no_show": item.get("no_show", False),
-                "notes": item.get("notes") or item.get("comments"),
-                "created_at": item.get("created_at") or item.get("created"),
-                "updated_at": item.get("updated_at") or item.get("updated")
-            }
+            elif active is None:
+                # Root list, the ShowMojo envelope, or any top-level list
+                if event == "start_array" and (prefix == "response.data" or "." not in prefix):
+                    active = prefix
+                    item_prefix = f"{prefix}.item" if prefix else "item"
+                    candidates[active] = [0, [], 0]
             
-            # DEBUG: Print first showing structure
-            if idx == 0:
-                print(f"DEBUG - First showing output: {json.dumps(showing, indent=2)[:500]}")
+            elif event == "end_array" and prefix == active:
+                active = None
             
-            showings.append(showing)
+            elif prefix == item_prefix:
+                if event in ("start_map", "start_array"):
+                    builder = ObjectBuilder()
+                    builder.event(event, value)
+                    depth = 1
+                else:
+                    self._collect(candidates[active], value, id_prefix)
+        
+        chosen = self._choose_candidate(candidates)
+        if chosen is None:
+            return []
         
-        print(f"Parsed {len(showings)} showings")
+        count, showings, skipped = candidates[chosen]
+        if skipped:
+            logger.warning("Skipped %d ShowMojo items that are not dicts", skipped)
+        logger.debug("Parsed %d showings", len(showings))
         return showings
     
+    def _collect(self, candidate: list, item, id_prefix: str) -> None:
+        """Map one streamed record into its candidate list"""
+        idx = candidate[0]
+        candidate[0] += 1
+        if isinstance(item, dict):
+            candidate[1].append(self._map_item(item, idx, id_prefix))
+        else:
+            candidate[2] += 1
+    
+    @staticmethod
+    def _choose_candidate(candidates: Dict[str, list]) -> Optional[str]:
+        """Streamed counterpart of the list selection in _parse_showings"""
+        if "" in candidates:
+            return ""
+        for prefix in ("response.data", *_LIST_KEYS):
+            if prefix in candidates and candidates[prefix][0]:
+                return prefix
+        # Any other non-empty top-level list, in document order
+        return next((prefix for prefix, candidate in candidates.items() if candidate[0]), None)
+    
+    def _map_item(self, item: Dict, idx: int, id_prefix: str = "showing") -> Showing:
+        """
+        Map a raw ShowMojo record to a Showing
+        
+        Args:
+            item: Raw showing record
+            idx: Position of the record in the report
+            id_prefix: Prefix for the fallback ID when the record has none
+        
+        Returns:
+            Parsed showing
+        """
+        if idx == 0 and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("First item structure: %s", _preview(item, 500))
+        
+        # Parse showtime into separate date and time
+        # Format: "5 Oct 2025, 8:00PM CDT" or "11 Oct 2025, 3:30PM CDT"
+        showtime_raw = item.get("showtime")
+        showing_date = None
+        showing_time = None
+        showing_datetime = None
+        
+        if showtime_raw:
+            try:
+                # Split by comma: ["5 Oct 2025", " 8:00PM CDT"]
+                parts = showtime_raw.split(",")
+                if len(parts) >= 2:
+                    showing_date = parts[0].strip()  # "5 Oct 2025"
+                    showing_time = parts[1].strip()  # "8:00PM CDT"
+                    showing_datetime = showtime_raw  # Keep full string for reference
+                    if idx == 0:
+                        logger.debug("Parsed showtime: date=%r, time=%r", showing_date, showing_time)
+            except Exception as e:
+                logger.warning("Could not parse showtime %r: %s", showtime_raw, e)
+                showing_datetime = showtime_raw
+        
+        showing = Showing()
+        # Aliases are in priority order; the first non-None one wins on every record
+        for key, aliases in _FIELD_ALIASES:
+            for alias in aliases:
+                value = item.get(alias)
+                if value is not None:
+                    setattr(showing, key, value)
+                    break
+        
+        if showing.showing_id is None:
+            showing.showing_id = f"{id_prefix}_{idx}"
+        showing.showing_date = showing_date
+        showing.showing_time = showing_time
+        showing.showing_datetime = showing_datetime
+        
+        if idx == 0 and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("First showing output: %s", _preview(showing.to_dict(), 500))
+        
+        return showing
+    
     def test_connection(self) -> bool:
         """
         Test connection to ShowMojo API
@@ -261,18 +518,30 @@ class ShowMojoClient:
         Returns:
             bool: True if connection successful
         """
+        # Credentials verified recently - no network round trip needed
+        if (self._auth_verified_at is not None
+                and time.monotonic() - self._auth_verified_at < AUTH_CACHE_SECONDS):
+            return True
+        
         try:
-            # Try to fetch last 1 day of data as a test
-            result = self.get_showings(days_back=1)
+            # Request an empty window and close without reading the body
+            today = date.today().isoformat()
+            with self.session.post(
+                self._report_url,
+                data=f"start_date={today}&end_date={today}".encode("ascii"),
+                timeout=10,
+                stream=True
+            ) as response:
+                ok = response.status_code in (200, 204)
             
-            if result.get("success"):
-                print("✅ ShowMojo connection successful")
-                return True
+            if ok:
+                self._auth_verified_at = time.monotonic()
+                logger.info("✅ ShowMojo connection successful")
             else:
-                print(f"❌ ShowMojo connection failed: {result.get('error')}")
-                return False
+                logger.warning("❌ ShowMojo connection failed: %d", response.status_code)
+            return ok
         except Exception as e:
-            print(f"❌ ShowMojo connection error: {e}")
+            logger.warning("❌ ShowMojo connection error: %s", e)
             return False
 
 
@@ -282,27 +551,27 @@ if __name__ == "__main__":
     from dotenv import load_dotenv
     
     load_dotenv()
+    logging.basicConfig(level=logging.INFO)
     
     email = os.getenv("SHOWMOJO_EMAIL")
     password = os.getenv("SHOWMOJO_PASSWORD")
     
     if email and password:
-        client = ShowMojoClient(email, password)
-        
-        # Test connection
-        if client.test_connection():
-            # Fetch last 7 days of showings
-            result = client.get_showings(days_back=7)
+        with ShowMojoClient(email, password) as client:
+            # Test connection
+            if client.test_connection():
+                # Fetch last 7 days of showings
+                result = client.get_showings(days_back=7)
             
-            if result.get("success"):
-                print(f"\n✅ Retrieved {len(result['showings'])} showings")
+                if result.get("success"):
+                    print(f"\n✅ Retrieved {len(result['showings'])} showings")
                 
-                # Print first showing as example
-                if result['showings']:
-                    print("\nExample showing:")
-                    print(json.dumps(result['showings'][0], indent=2))
-            else:
-                print(f"\n❌ Failed to get showings: {result.get('error')}")
+                    # Print first showing as example
+                    if result['showings']:
+                        print("\nExample showing:")
+                        print(json.dumps(result['showings'][0].to_dict(), indent=2))
+                else:
+                    print(f"\n❌ Failed to get showings: {result.get('error')}")
     else:
         print("❌ SHOWMOJO_EMAIL and SHOWMOJO_PASSWORD environment variables not set")
 
@@ -4,13 +4,64 @@ Practical approach for checking listing syndication status
 Uses a combination of API checks and simulated results
 """
 import requests
-from typing import Dict, List
+from cachetools import TTLCache
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
 from urllib.parse import quote
+import numpy as np
+import orjson
+import string
+import sys
+import threading
 import time
-import random
+
+
+# Lowercase ASCII and turn spaces into hyphens in a single pass
+_SLUG_TRANS = str.maketrans(string.ascii_uppercase + " ", string.ascii_lowercase + "-")
+
+
+def _slugify(text: str) -> str:
+    """URL slug: lowercase with spaces as hyphens"""
+    if text.isascii():
+        return text.translate(_SLUG_TRANS)
+    return text.lower().replace(" ", "-")
+
+
+# (epoch second, formatted local time) of the last timestamp handed out
+_ts_cache = (0, "")
+
+
+def _timestamp() -> str:
+    """Current local time as "%Y-%m-%d %H:%M:%S", formatted at most once per second"""
+    global _ts_cache
+    t = int(time.time())
+    cached = _ts_cache
+    if cached[0] != t:
+        cached = _ts_cache = (t, sys.intern(time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t))))
+    return cached[1]
+
+
+class SiteResult(NamedTuple):
+    """Syndication status of one site"""
+    found: bool
+    url: str
+    last_checked: str
 
 
 class SyndicationChecker:
+    # Search URL per site; {city}, {state} and {address} are slugs
+    _URL_TEMPLATES = {
+        "Zillow": "https://www.zillow.com/homes/{city}-{state}",
+        "Zumper": "https://www.zumper.com/apartments-for-rent/{city}-{state}",
+        "HotPads": "https://hotpads.com/{city}-{state}/apartments-for-rent",
+        "Realtor.com": "https://www.realtor.com/realestateandhomes-search/{city}_{state}",
+        "Redfin": "https://www.redfin.com/{state}/{city}",
+        "Trulia": "https://www.trulia.com/{state}/{city}/",
+        "Apartments.com": "https://www.apartments.com/{city}-{state}/",
+        "Rent.com": "https://www.rent.com/{state}/{city}",
+        "Rentable": "https://www.rentable.co/{state}/{city}",
+    }
+    
     def __init__(self):
         # Top 6 priority sites
         self.top_6 = ["Zillow", "Zumper", "HotPads", "Realtor.com", "Redfin", "Trulia"]
@@ -26,6 +77,17 @@ class SyndicationChecker:
             "Rentler", "Trovit"
         ]
         
+        # Per-property result cache (check_all_sites runs in worker threads)
+        self._cache = TTLCache(maxsize=1024, ttl=3600)
+        self._cache_lock = threading.Lock()
+        
+        # Vectorized simulation state
+        self._rng = np.random.default_rng()
+        self._all_sites_np = np.array(self.all_sites)
+        self._top_6_mask = np.isin(self._all_sites_np, self.top_6)
+        self._top_6_enum = list(enumerate(self._all_sites_np[self._top_6_mask].tolist()))
+        self._top_6_weights = 1 << np.arange(len(self._top_6_enum))
+        
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }
@@ -51,80 +113,97 @@ class SyndicationChecker:
         """
         # Simulate realistic syndication results
         # In production, this would check actual syndication logs from ShowMojo/PMS
-        sites_found = []
-        sites_not_found = []
-        site_details = {}
+        # Repeat checks of the same property reuse the last result for an hour
+        key = (address.strip().lower(), city.strip().lower(), state.strip().lower())
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return self._to_response(cached)
+        
+        rng = self._rng
         
         # Simulate typical syndication coverage (60-80% for active listings)
-        coverage_rate = random.uniform(0.6, 0.8)
-        num_sites_found = int(len(self.all_sites) * coverage_rate)
+        coverage_rate = rng.uniform(0.6, 0.8)
         
         # Top 6 sites typically have higher coverage (80-100%)
-        top_6_coverage = random.uniform(0.8, 1.0)
-        top_6_found_count = int(len(self.top_6) * top_6_coverage)
-        
-        # Randomly select which sites found the listing
-        found_sites = random.sample(self.all_sites, num_sites_found)
-        
-        # Ensure at least some top 6 sites are included
-        top_6_found = random.sample(self.top_6, top_6_found_count)
-        found_sites = list(set(found_sites + top_6_found))
-        
-        # Build results
-        for site in self.all_sites:
-            if site in found_sites:
-                sites_found.append(site)
-                site_details[site] = {
-                    "found": True,
-                    "url": self._get_site_url(site, address, city, state),
-                    "last_checked": time.strftime("%Y-%m-%d %H:%M:%S")
-                }
-            else:
-                sites_not_found.append(site)
-                site_details[site] = {
-                    "found": False,
-                    "url": self._get_site_url(site, address, city, state),
-                    "last_checked": time.strftime("%Y-%m-%d %H:%M:%S")
-                }
-        
-        # Count top 6 sites found
-        actual_top_6_found = len([s for s in sites_found if s in self.top_6])
-        
-        # Build top 6 status dict
-        top_6_status = {site: site in sites_found for site in self.top_6}
+        top_6_coverage = rng.uniform(0.8, 1.0)
         
-        return {
+        # Draw which sites found the listing as a boolean mask over all_sites
+        num_sites = len(self._all_sites_np)
+        found_mask = rng.random(num_sites) < coverage_rate
+        found_mask |= self._top_6_mask & (rng.random(num_sites) < top_6_coverage)
+        
+        sites_found = self._all_sites_np[found_mask].tolist()
+        sites_not_found = self._all_sites_np[~found_mask].tolist()
+        
+        now = _timestamp()
+        site_details = {
+            site: SiteResult(is_found, self._get_site_url(site, address, city, state), now)
+            for site, is_found in zip(self.all_sites, found_mask.tolist())
+        }
+        
+        # Top 6 status packed as an int: bit i set when the i-th top site found it
+        top_6_bits = int(found_mask[self._top_6_mask] @ self._top_6_weights)
+        actual_top_6_found = top_6_bits.bit_count()
+        
+        result = {
             "total_sites_checked": len(self.all_sites),
             "total_sites_found": len(sites_found),
             "total_sites_not_found": len(sites_not_found),
             "top_6_found_count": actual_top_6_found,
-            "top_6_sites_status": top_6_status,
+            "top_6_sites_status": top_6_bits,  # expanded by _to_response
             "sites_found": sites_found,
             "sites_not_found": sites_not_found,
             "site_details": site_details,
             "coverage_percentage": round((len(sites_found) / len(self.all_sites)) * 100, 1),
             "note": "Syndication data based on property management system logs and API checks"
         }
+        
+        with self._cache_lock:
+            self._cache[key] = result
+        
+        return self._to_response(result)
+    
+    def check_all_sites_json(self, address: str, city: str, state: str) -> bytes:
+        """check_all_sites serialized straight to JSON bytes"""
+        return orjson.dumps(self.check_all_sites(address, city, state))
+    
+    def _to_response(self, result: Dict) -> Dict:
+        """
+        Build the JSON-ready response from a (possibly cached) result
+        
+        Containers are rebuilt so callers can't mutate the cached entry, and
+        the top 6 bitmask and SiteResult records are expanded to dicts only here.
+        """
+        top_6_bits = result["top_6_sites_status"]
+        response = dict(result)
+        response["top_6_sites_status"] = {site: bool(top_6_bits >> i & 1) for i, site in self._top_6_enum}
+        response["sites_found"] = list(result["sites_found"])
+        response["sites_not_found"] = list(result["sites_not_found"])
+        response["site_details"] = {
+            site: details._asdict() for site, details in result["site_details"].items()
+        }
+        return response
     
     def _get_site_url(self, site: str, address: str, city: str, state: str) -> str:
         """Generate URL for a site"""
-        city_slug = city.lower().replace(" ", "-")
-        state_slug = state.lower()
-        address_slug = address.lower().replace(" ", "-")
-        
-        url_templates = {
-            "Zillow": f"https://www.zillow.com/homes/{city_slug}-{state_slug}",
-            "Zumper": f"https://www.zumper.com/apartments-for-rent/{city_slug}-{state_slug}",
-            "HotPads": f"https://hotpads.com/{city_slug}-{state_slug}/apartments-for-rent",
-            "Realtor.com": f"https://www.realtor.com/realestateandhomes-search/{city_slug}_{state_slug}",
-            "Redfin": f"https://www.redfin.com/{state_slug}/{city_slug}",
-            "Trulia": f"https://www.trulia.com/{state_slug}/{city_slug}/",
-            "Apartments.com": f"https://www.apartments.com/{city_slug}-{state_slug}/",
-            "Rent.com": f"https://www.rent.com/{state_slug}/{city_slug}",
-            "Rentable": f"https://www.rentable.co/{state_slug}/{city_slug}",
-        }
-        
-        return url_templates.get(site, f"https://www.{site.lower().replace(' ', '')}.com")
+        return self._build_url(site, address, city, state)
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _build_url(site: str, address: str, city: str, state: str) -> str:
+        """Generate (and memoize) the URL for a site and property"""
+        template = SyndicationChecker._URL_TEMPLATES.get(site)
+        if template is None:
+            return f"https://www.{site.lower().replace(' ', '')}.com"
+        
+        city_slug, state_slug, address_slug = SyndicationChecker._slugs(address, city, state)
+        return template.format(city=city_slug, state=state_slug, address=address_slug)
+    
+    @staticmethod
+    def _slugs(address: str, city: str, state: str) -> Tuple[str, str, str]:
+        """URL slugs for (city, state, address)"""
+        return _slugify(city), state.lower(), _slugify(address)
     
     def check_site_manual(self, site_name: str, address: str, city: str, state: str) -> Dict:
         """
@@ -2,11 +2,208 @@
 Syndication Checker
 Searches 27 rental syndication sites to verify listing presence
 """
+import ahocorasick
+import aiohttp
+import asyncio
+import pybreaker
 import requests
-from bs4 import BeautifulSoup
-from typing import Dict, List
-from urllib.parse import quote
-import time
+from requests.adapters import HTTPAdapter
+from urllib3 import PoolManager
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError
+from urllib3.util.retry import Retry
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlparse
+import atexit
+import re
+import socket
+import string
+import threading
+
+
+# (connect, read) seconds - a dead host fails fast instead of eating the full budget
+REQUEST_TIMEOUT = (3.05, 7)
+
+# Concurrent site checks on the sync path (the session pool holds 32 connections)
+SYNC_WORKERS = 16
+
+# Byte-level ASCII lowercasing and the whitespace ignored when matching addresses
+_LOWER_TABLE = bytes.maketrans(string.ascii_uppercase.encode(), string.ascii_lowercase.encode())
+_WHITESPACE = b" \t\r\n"
+
+
+# Street-type spellings a listing page may use for the same address
+_STREET_ABBREVIATIONS = {
+    "street": "st", "avenue": "ave", "drive": "dr", "road": "rd", "boulevard": "blvd",
+    "lane": "ln", "court": "ct", "place": "pl", "circle": "cir", "parkway": "pkwy",
+    "highway": "hwy", "terrace": "ter", "trail": "trl"
+}
+_STREET_EXPANSIONS = {abbr: word for word, abbr in _STREET_ABBREVIATIONS.items()}
+
+# Trailing unit designator, e.g. "Apt 2", "Unit B", "#104"
+_UNIT_PATTERN = re.compile(
+    r"\s*,?\s*(?:\b(?:apt|apartment|unit|suite|ste)\b\.?|#)\s*[\w-]+\s*$", re.IGNORECASE
+)
+
+
+def _address_variants(address: str) -> set:
+    """The address with and without its unit, in abbreviated and spelled-out street forms"""
+    variants = set()
+    for base in (address, _UNIT_PATTERN.sub("", address)):
+        words = base.lower().replace(".", "").split()
+        variants.add(" ".join(words))
+        variants.add(" ".join(_STREET_ABBREVIATIONS.get(w, w) for w in words))
+        variants.add(" ".join(_STREET_EXPANSIONS.get(w, w) for w in words))
+    return variants
+
+
+def _normalize(data: bytes) -> str:
+    """Lowercase ASCII and drop whitespace; latin-1 keeps it a 1:1 byte -> char map"""
+    return data.translate(_LOWER_TABLE, _WHITESPACE).decode("latin-1")
+
+
+@lru_cache(maxsize=256)
+def _address_automaton(address: str) -> Tuple[Optional[ahocorasick.Automaton], int]:
+    """Aho-Corasick automaton over the normalized address variants, plus the longest variant length"""
+    needles = {_normalize(v.encode()) for v in _address_variants(address)} - {""}
+    if not needles:
+        return None, 0
+    
+    automaton = ahocorasick.Automaton()
+    for needle in needles:
+        automaton.add_word(needle, needle)
+    automaton.make_automaton()
+    return automaton, max(map(len, needles))
+
+
+class _StreamMatcher:
+    """Case- and whitespace-insensitive search for any address variant over a chunked byte stream"""
+    __slots__ = ("automaton", "keep", "tail")
+    
+    def __init__(self, address: str):
+        self.automaton, longest = _address_automaton(address)
+        self.keep = longest - 1
+        self.tail = ""
+    
+    def feed(self, chunk: bytes) -> bool:
+        """Return True once any address variant has appeared in the stream so far"""
+        if self.automaton is None:
+            return True  # empty address matches trivially
+        
+        window = self.tail + _normalize(chunk)
+        for _ in self.automaton.iter(window):
+            return True
+        # Keep enough characters to catch a match straddling the chunk boundary
+        self.tail = window[-self.keep:] if self.keep else ""
+        return False
+
+
+# The sync path resolves the same ~27 hostnames on every scan; each checker keeps
+# getaddrinfo results (successes only) for DNS_CACHE_SECONDS on its own session
+DNS_CACHE_SECONDS = 300
+
+
+class _DNSCache:
+    """Thread-safe TTL cache of getaddrinfo results, keyed by (host, port)"""
+    
+    def __init__(self, ttl: float = DNS_CACHE_SECONDS):
+        self._cache = TTLCache(maxsize=128, ttl=ttl)
+        self._lock = threading.Lock()
+    
+    def resolve(self, host: str, port: int) -> list:
+        with self._lock:
+            cached = self._cache.get((host, port))
+        if cached is not None:
+            return cached
+        
+        result = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        with self._lock:
+            self._cache[(host, port)] = result
+        return result
+
+
+class _CachedDNSConnectionMixin:
+    """
+    Connect to the cached addresses of the host instead of resolving it on every new connection
+    
+    Hooks urllib3 2.x connection internals (_dns_host, _new_conn); urllib3 is pinned to 2.x.
+    """
+    
+    def __init__(self, *args, dns_cache: _DNSCache, **kwargs):
+        self._dns_cache = dns_cache
+        super().__init__(*args, **kwargs)
+    
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            addresses = self._dns_cache.resolve(host, self.port)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        
+        # Same fallback order as socket.create_connection; numeric hosts skip DNS
+        error = None
+        try:
+            for *_, sockaddr in addresses:
+                self._dns_host = sockaddr[0]
+                try:
+                    return super()._new_conn()
+                except ConnectTimeoutError as e:  # also covers NewConnectionError
+                    error = e
+        finally:
+            self._dns_host = host
+        raise error
+
+
+class _CachedDNSHTTPConnection(_CachedDNSConnectionMixin, HTTPConnection):
+    pass
+
+
+class _CachedDNSHTTPSConnection(_CachedDNSConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _CachedDNSPoolManager(PoolManager):
+    """Pool manager whose connections resolve hosts through a shared _DNSCache"""
+    
+    def __init__(self, *args, dns_cache: _DNSCache, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._dns_cache = dns_cache
+    
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool.ConnectionCls = _CachedDNSHTTPSConnection if scheme == "https" else _CachedDNSHTTPConnection
+        pool.conn_kw["dns_cache"] = self._dns_cache
+        return pool
+
+
+class _CachedDNSAdapter(HTTPAdapter):
+    """HTTPAdapter that caches DNS lookups for the session it is mounted on"""
+    
+    def __init__(self, dns_cache: _DNSCache, **kwargs):
+        self._dns_cache = dns_cache
+        super().__init__(**kwargs)
+    
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _CachedDNSPoolManager(
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            dns_cache=self._dns_cache,
+            **pool_kwargs
+        )
+
+
+class _BreakerLogger(pybreaker.CircuitBreakerListener):
+    """Report circuit breaker state transitions"""
+    
+    def state_change(self, cb, old_state, new_state):
+        print(f"Circuit breaker for {cb.name}: {old_state.name} -> {new_state.name}")
 
 
 class SyndicationChecker:
@@ -51,6 +248,76 @@ class SyndicationChecker:
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         }
+        
+        # Top 6 sites are checked first
+        self._check_order = self.top_6 + [s for s in self.sites if s not in self.top_6]
+        
+        # Pooled session so repeat hosts (and shared CDNs) skip the TCP/TLS handshake
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = _CachedDNSAdapter(
+            _DNSCache(),
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.5,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=frozenset(["GET"]),
+                respect_retry_after_header=True
+            )
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        atexit.register(self.close)
+        
+        # Per-host circuit breakers for the sync path
+        self._breakers: Dict[str, pybreaker.CircuitBreaker] = {}
+        
+        # aiohttp session for the async path, created inside the first event loop that
+        # needs it so its connection pool and DNS cache carry over between checks
+        self._aio_session: Optional[aiohttp.ClientSession] = None
+        self._aio_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def close(self):
+        """Release pooled connections"""
+        self.session.close()
+        
+        session, loop = self._aio_session, self._aio_loop
+        self._aio_session = self._aio_loop = None
+        if session is None or session.closed or loop.is_closed():
+            return
+        if loop.is_running():
+            loop.create_task(session.close())
+        else:
+            loop.run_until_complete(session.close())
+    
+    async def aclose(self):
+        """Release the async path's pooled connections from inside the event loop"""
+        if self._aio_session is not None:
+            session = self._aio_session
+            self._aio_session = self._aio_loop = None
+            await session.close()
+    
+    def _get_aio_session(self) -> aiohttp.ClientSession:
+        """The shared aiohttp session, recreated if it belongs to a different event loop"""
+        loop = asyncio.get_running_loop()
+        if self._aio_session is None or self._aio_session.closed or self._aio_loop is not loop:
+            self._aio_session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(connect=REQUEST_TIMEOUT[0], sock_read=REQUEST_TIMEOUT[1]),
+                connector=aiohttp.TCPConnector(
+                    limit=64,
+                    limit_per_host=2,
+                    # getaddrinfo in a worker thread; the cache below keeps repeat lookups off it
+                    resolver=aiohttp.ThreadedResolver(),
+                    ttl_dns_cache=600,
+                    use_dns_cache=True,
+                    family=socket.AF_INET
+                )
+            )
+            self._aio_loop = loop
+        return self._aio_session
     
     def check_all_sites(self, address: str, city: str, state: str) -> Dict:
         """
@@ -64,34 +331,54 @@ class SyndicationChecker:
         Returns:
             Dict with syndication status
         """
+        # Every site is a different host, so the checks run side by side on the pooled session
+        with ThreadPoolExecutor(max_workers=SYNC_WORKERS) as executor:
+            futures = {
+                executor.submit(self._check_site, site_name, address, city, state): site_name
+                for site_name in self._check_order
+            }
+            outcomes = {futures[future]: future.result() for future in as_completed(futures)}
+        
+        checks = [(site_name, *outcomes[site_name]) for site_name in self._check_order]
+        return self._summarize(checks)
+    
+    async def check_all_sites_async(self, address: str, city: str, state: str) -> Dict:
+        """
+        Check all 27 syndication sites concurrently
+        
+        Args:
+            address: Property address (e.g., "10224 Olivia Dr")
+            city: City name (e.g., "McKinney")
+            state: State abbreviation (e.g., "TX")
+        
+        Returns:
+            Dict with syndication status (same shape as check_all_sites)
+        """
+        session = self._get_aio_session()
+        results = await asyncio.gather(
+            *(self._check_site_async(session, site_name, address, city, state)
+              for site_name in self._check_order),
+            return_exceptions=True
+        )
+        
+        checks = [
+            (site_name, False, "") if isinstance(result, BaseException) else (site_name, *result)
+            for site_name, result in zip(self._check_order, results)
+        ]
+        return self._summarize(checks)
+    
+    def _summarize(self, checks: List[Tuple[str, bool, str]]) -> Dict:
+        """Build the syndication status dict from (site_name, found, url) checks"""
         sites_found = []
         sites_not_found = []
         site_details = {}
         
-        # Check top 6 sites first
-        for site_name in self.top_6:
-            found, url = self._check_site(site_name, address, city, state)
+        for site_name, found, url in checks:
             if found:
                 sites_found.append(site_name)
-                site_details[site_name] = {"found": True, "url": url}
             else:
                 sites_not_found.append(site_name)
-                site_details[site_name] = {"found": False, "url": url}
-            
-            time.sleep(0.5)  # Rate limiting
-        
-        # Check remaining sites
-        for site_name in self.sites.keys():
-            if site_name not in self.top_6:
-                found, url = self._check_site(site_name, address, city, state)
-                if found:
-                    sites_found.append(site_name)
-                    site_details[site_name] = {"found": True, "url": url}
-                else:
-                    sites_not_found.append(site_name)
-                    site_details[site_name] = {"found": False, "url": url}
-                
-                time.sleep(0.5)  # Rate limiting
+            site_details[site_name] = {"found": found, "url": url}
         
         top_6_found_count = len([s for s in sites_found if s in self.top_6])
         
@@ -104,6 +391,14 @@ class SyndicationChecker:
             "site_details": site_details
         }
     
+    def _format_url(self, site_name: str, address: str, city: str, state: str) -> str:
+        """Fill a site's search URL template"""
+        return self.sites.get(site_name, "").format(
+            address=quote(address),
+            city=city.lower().replace(" ", "-"),
+            state=state.lower()
+        )
+    
     def _check_site(self, site_name: str, address: str, city: str, state: str) -> tuple:
         """
         Check if listing is on a specific site
@@ -112,29 +407,101 @@ class SyndicationChecker:
             (found: bool, url: str)
         """
         try:
-            url_template = self.sites.get(site_name, "")
-            
-            # Format URL
-            url = url_template.format(
-                address=quote(address),
-                city=city.lower().replace(" ", "-"),
-                state=state.lower()
-            )
+            url = self._format_url(site_name, address, city, state)
             
-            # Make request
-            response = requests.get(url, headers=self.headers, timeout=10)
+            # Hosts that keep failing are skipped until their breaker resets
+            breaker = self._breaker_for(urlparse(url).hostname)
             
-            if response.status_code == 200:
-                # Check if address appears in page content
-                content = response.text.lower()
-                address_clean = address.lower().replace(" ", "")
-                
-                # Simple check: if address appears in content
-                if address_clean in content.replace(" ", ""):
-                    return (True, url)
+            # Stream the page and stop reading as soon as the address appears
+            with breaker.call(self._get_page, url) as response:
+                if response.status_code == 200:
+                    matcher = _StreamMatcher(address)
+                    for chunk in response.iter_content(chunk_size=65536):
+                        if matcher.feed(chunk):
+                            return (True, url)
             
             return (False, url)
         
+        except pybreaker.CircuitBreakerError:
+            return (False, url)
+        
         except Exception as e:
             print(f"Error checking {site_name}: {e}")
             return (False, url if 'url' in locals() else "")
+    
+    def _get_page(self, url: str) -> requests.Response:
+        """Open a streamed GET, raising on responses that should trip the breaker"""
+        response = self.session.get(url, timeout=REQUEST_TIMEOUT, stream=True)
+        if response.status_code == 403 or response.status_code >= 500:
+            response.close()
+            raise requests.HTTPError(f"{response.status_code} from {url}", response=response)
+        return response
+    
+    def _breaker_for(self, host: str) -> pybreaker.CircuitBreaker:
+        """Circuit breaker for a host: open after 3 failures, retry after 5 minutes"""
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers.setdefault(host, pybreaker.CircuitBreaker(
+                fail_max=3,
+                reset_timeout=300,
+                name=host,
+                listeners=[_BreakerLogger()]
+            ))
+        return breaker
+    
+    async def _check_site_async(
+        self,
+        session: aiohttp.ClientSession,
+        site_name: str,
+        address: str,
+        city: str,
+        state: str
+    ) -> tuple:
+        """
+        Check if listing is on a specific site without blocking the event loop
+        
+        Returns:
+            (found: bool, url: str)
+        """
+        url = self._format_url(site_name, address, city, state)
+        
+        try:
+            async with session.get(url) as response:
+                if response.status == 200:
+                    matcher = _StreamMatcher(address)
+                    async for chunk in response.content.iter_chunked(65536):
+                        if matcher.feed(chunk):
+                            return (True, url)
+            
+            return (False, url)
+        
+        except Exception as e:
+            print(f"Error checking {site_name}: {e}")
+            return (False, url)
+
+
+# Check a property directly
+if __name__ == "__main__":
+    import sys
+    
+    # uvloop cuts per-callback overhead when fanning out to every site at once
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
+    async def main(address: str, city: str, state: str) -> Dict:
+        checker = SyndicationChecker()
+        try:
+            return await checker.check_all_sites_async(address, city, state)
+        finally:
+            await checker.aclose()
+    
+    address, city, state = sys.argv[1:4] if len(sys.argv) >= 4 else ("10224 Olivia Dr", "McKinney", "TX")
+    results = asyncio.run(main(address, city, state))
+    
+    print(f"Found on {results['total_sites_found']}/{results['total_sites_checked']} sites")
+    print(f"Top 6 sites: {results['top_6_found_count']}/6")
+    for site_name in results["sites_found"]:
+        print(f"  ✓ {site_name}")
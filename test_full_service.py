@@ -2,24 +2,12 @@
 Full service integration test
 Tests both market analysis and syndication check endpoints
 """
-import requests
+import asyncio
+import httpx
 import json
-import time
 
 BASE_URL = "http://localhost:8000"
 
-print("=" * 70)
-print("LEASING INTELLIGENCE SERVICE - FULL INTEGRATION TEST")
-print("=" * 70)
-
-# Test 1: Health Check
-print("\n1. Testing Health Check...")
-response = requests.get(f"{BASE_URL}/")
-print(f"   Status: {response.status_code}")
-print(f"   Response: {json.dumps(response.json(), indent=2)}")
-
-# Test 2: Market Analysis
-print("\n2. Testing Market Analysis Endpoint...")
 market_request = {
     "listing_id": "test-listing-001",
     "address": "5500 Grand Lake Dr",
@@ -34,13 +22,6 @@ market_request = {
     "radius": 0.5
 }
 
-print(f"   Request: {json.dumps(market_request, indent=2)}")
-response = requests.post(f"{BASE_URL}/analyze-market", json=market_request)
-print(f"   Status: {response.status_code}")
-print(f"   Response: {json.dumps(response.json(), indent=2)}")
-
-# Test 3: Syndication Check
-print("\n3. Testing Syndication Check Endpoint...")
 syndication_request = {
     "listing_id": "test-listing-001",
     "address": "5500 Grand Lake Dr",
@@ -56,14 +37,44 @@ syndication_request = {
     "photos_count": 18
 }
 
-print(f"   Request: {json.dumps(syndication_request, indent=2)}")
-response = requests.post(f"{BASE_URL}/check-syndication", json=syndication_request)
-print(f"   Status: {response.status_code}")
-print(f"   Response: {json.dumps(response.json(), indent=2)}")
 
-print("\n" + "=" * 70)
-print("✅ ALL TESTS COMPLETED")
-print("=" * 70)
-print("\nNote: Background tasks are processing. Check server.log for details.")
-print("Wait 10-15 seconds, then check the log file:")
-print("  tail -50 server.log")
+async def main():
+    print("=" * 70)
+    print("LEASING INTELLIGENCE SERVICE - FULL INTEGRATION TEST")
+    print("=" * 70)
+
+    # Fire all three requests concurrently; report once they are all back
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=30) as client:
+        health, market, syndication = await asyncio.gather(
+            client.get("/"),
+            client.post("/analyze-market", json=market_request),
+            client.post("/check-syndication", json=syndication_request)
+        )
+
+    # Test 1: Health Check
+    print("\n1. Testing Health Check...")
+    print(f"   Status: {health.status_code}")
+    print(f"   Response: {json.dumps(health.json(), indent=2)}")
+
+    # Test 2: Market Analysis
+    print("\n2. Testing Market Analysis Endpoint...")
+    print(f"   Request: {json.dumps(market_request, indent=2)}")
+    print(f"   Status: {market.status_code}")
+    print(f"   Response: {json.dumps(market.json(), indent=2)}")
+
+    # Test 3: Syndication Check
+    print("\n3. Testing Syndication Check Endpoint...")
+    print(f"   Request: {json.dumps(syndication_request, indent=2)}")
+    print(f"   Status: {syndication.status_code}")
+    print(f"   Response: {json.dumps(syndication.json(), indent=2)}")
+
+    print("\n" + "=" * 70)
+    print("✅ ALL TESTS COMPLETED")
+    print("=" * 70)
+    print("\nNote: Background tasks are processing. Check server.log for details.")
+    print("Wait 10-15 seconds, then check the log file:")
+    print("  tail -50 server.log")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
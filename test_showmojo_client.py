@@ -0,0 +1,58 @@
+"""
+ShowMojo parser parity test
+Feeds the same report bodies through the buffered and streaming parsers
+"""
+import io
+import orjson
+
+from showmojo_client import ShowMojoClient
+
+RECORD = {
+    "showing_id": "abc-1",
+    "property_address": "5500 Grand Lake Dr",
+    "showtime": "2024-05-01T10:00:00Z",
+    "prospect_name": "Jane Doe",
+    "status": "completed",
+    "feedback": "Liked the yard",
+}
+
+bodies = {
+    "envelope": {"response": {"data": [RECORD, RECORD]}},
+    "data key": {"data": [RECORD]},
+    "bare list": [RECORD, {"id": "abc-2"}, 3],
+    "other key": {"meta": {"count": 1}, "items": [RECORD]},
+    "empty": {"response": {"data": []}},
+    "mixed schema": {"data": [{"property_id": "P-old"}, {"listing_uid": "L-2", "property_id": "P-2"}]},
+}
+
+
+def check_record_order(client):
+    """A record maps the same whether or not other schemas came before it"""
+    mixed = [{"property_id": "P-old"}, {"listing_uid": "L-2", "property_id": "P-2"}]
+    alone = client._parse_showings(mixed[1:])[0]
+    after = client._parse_showings(mixed)[1]
+    assert alone.property_id == after.property_id == "L-2", (alone, after)
+    print("✅ record order: mixed schemas map independently")
+
+
+def parse_both(client, body):
+    raw = orjson.dumps(body)
+    buffered = client._parse_showings(orjson.loads(raw))
+    streamed = client._parse_showings_stream(io.BytesIO(raw))
+    return buffered, streamed
+
+
+def main():
+    client = ShowMojoClient("user", "token")
+    try:
+        for name, body in bodies.items():
+            buffered, streamed = parse_both(client, body)
+            assert [s.to_dict() for s in buffered] == [s.to_dict() for s in streamed], name
+            print(f"✅ {name}: {len(streamed)} showings")
+        check_record_order(client)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
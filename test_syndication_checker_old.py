@@ -0,0 +1,30 @@
+"""
+Address matching test for the legacy syndication checker
+Unit stripping must not cut street names, and real unit forms must still match
+"""
+from syndication_checker_old import _StreamMatcher, _address_variants
+
+# (listing address, page text, expected match)
+cases = [
+    ("12 Chester", b"<li>12 Cherry Lane</li>", False),
+    ("77 N Webster", b"<li>77 N Web St</li>", False),
+    ("400 Unity Ave", b"<li>400 Un</li>", False),
+    ("12 Chester", b"<li>12  CHESTER</li>", True),
+    ("10224 Olivia Dr Apt 2", b"<li>10224 Olivia Drive</li>", True),
+    ("5500 Grand Lake Dr, Unit B", b"<li>5500 Grand Lake Dr</li>", True),
+    ("88 Elm St #104", b"<li>88 Elm Street</li>", True),
+    ("9 Oak Ct Ste. 3", b"<li>9 Oak Court</li>", True),
+]
+
+
+def main():
+    assert "12 che" not in _address_variants("12 Chester")
+    assert "77 n web" not in _address_variants("77 N Webster")
+    
+    for address, page, expected in cases:
+        assert _StreamMatcher(address).feed(page) is expected, (address, page)
+        print(f"✅ {address!r} vs {page!r}: {expected}")
+
+
+if __name__ == "__main__":
+    main()